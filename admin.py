@@ -0,0 +1,116 @@
+import os
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+import aggregates
+import assessment_store
+import diagnostic
+import scoring
+
+# Reads only the aggregates table (see aggregates.py), whose size does not
+# grow with the number of stored assessments.
+# Run with: streamlit run admin.py
+
+st.set_page_config(page_title="Assessment Analytics", page_icon="📈", layout="wide")
+
+DB_PATH = assessment_store.database_path()
+
+
+def load_aggregates(path):
+    if not os.path.exists(path):
+        return {}
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return aggregates.read(connection)
+    except sqlite3.OperationalError:
+        # Database created before aggregates existed; see aggregates.py rebuild
+        return {}
+    finally:
+        connection.close()
+
+
+def counter_frame(buckets, order=None, value_name='Average'):
+    keys = [key for key in order if key in buckets] if order else sorted(buckets)
+    total = sum(entry['count'] for entry in buckets.values())
+    return pd.DataFrame({
+        'Count': [buckets[key]['count'] for key in keys],
+        'Share': [buckets[key]['count'] / total for key in keys],
+        value_name: [buckets[key]['total'] / buckets[key]['count'] for key in keys],
+    }, index=keys)
+
+
+def histogram_frame(buckets, bins, fmt):
+    return pd.DataFrame({'Count': [buckets.get(str(edge), {}).get('count', 0) for edge in bins]},
+                        index=[fmt(edge) for edge in bins])
+
+
+def show_metrics(metrics, labels):
+    count = next(iter(metrics.values()))['count']
+    columns = st.columns(len(labels) + 1)
+    columns[0].metric("Assessments", f"{count:,}")
+    for column, (metric, (label, fmt)) in zip(columns[1:], labels.items()):
+        column.metric(label, fmt.format(metrics[metric]['total'] / count))
+
+
+def show_maturity(data):
+    show_metrics(data['metric'], {
+        'total_annual_cost': ("Avg annual cost", "${:,.0f}"),
+        'risk_exposure': ("Avg risk exposure", "${:,.0f}"),
+        'time_wasted': ("Avg hours wasted", "{:,.0f}"),
+    })
+    reruns = data.get('session', {}).get('full_reruns')
+    if reruns:
+        st.caption(f"Full page reruns per completed assessment: {reruns['total'] / reruns['count']:.1f}")
+    st.subheader("Total annual cost")
+    st.bar_chart(histogram_frame(data.get('total_annual_cost_histogram', {}), aggregates.COST_BINS,
+                                 lambda edge: f"${edge:,}+"))
+    st.subheader("Answers")
+    for question in scoring.questions:
+        buckets = data.get(f"option:{question['id']}")
+        if buckets:
+            st.markdown(f"**{question['question']}**")
+            frame = counter_frame(buckets, [o['value'] for o in question['options']], 'Avg annual cost')
+            frame.index = [scoring.registry[question['id']].option(value).label for value in frame.index]
+            st.dataframe(frame, use_container_width=True)
+
+
+def show_executive(data):
+    show_metrics(data['metric'], {
+        'pain_score': ("Avg pain score", "{:.2f}"),
+        'opportunity_cost': ("Avg revenue at risk", "${:,.0f}"),
+        'roi': ("Avg ROI", "{:,.0f}%"),
+    })
+    st.subheader("Diagnosis")
+    st.dataframe(counter_frame(data.get('tier', {}), [name for _, name in diagnostic.DIAGNOSIS_TIERS],
+                               'Avg revenue at risk'), use_container_width=True)
+    st.subheader("Pain score")
+    st.bar_chart(histogram_frame(data.get('pain_score_histogram', {}), aggregates.PAIN_BINS,
+                                 lambda edge: f"{edge:.1f}+"))
+    st.subheader("Answers")
+    for question in diagnostic.pain_questions + [diagnostic.revenue_question]:
+        buckets = data.get(f"option:{question['id']}")
+        if buckets:
+            st.markdown(f"**{question['question']}**")
+            st.dataframe(counter_frame(buckets, question['options'], 'Avg pain score'), use_container_width=True)
+
+
+st.title("📈 Assessment Analytics")
+st.caption(f"Database: {DB_PATH}")
+
+data = load_aggregates(DB_PATH)
+if not data:
+    st.info("No assessments stored yet.")
+else:
+    maturity_tab, executive_tab = st.tabs(["Maturity assessment", "Executive diagnostic"])
+    with maturity_tab:
+        if 'maturity' in data:
+            show_maturity(data['maturity'])
+        else:
+            st.info("No maturity assessments stored yet.")
+    with executive_tab:
+        if 'executive' in data:
+            show_executive(data['executive'])
+        else:
+            st.info("No executive diagnostics stored yet.")
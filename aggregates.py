@@ -0,0 +1,131 @@
+# Incrementally maintained analytics over stored assessments.
+# Every stored assessment adds to a fixed set of (dimension, bucket) counters
+# (a count and a running sum) in the same transaction that stores it. The
+# aggregates table size depends only on the question bank and histogram
+# bins, not on how many assessments are stored, so the admin page reads it
+# in constant time.
+#
+#   maturity:   metric totals, a histogram of total_annual_cost, full script
+#               reruns per assessment and, per question, a count of each
+#               option with the cost it led to
+#   executive:  metric totals, a diagnosis tier count with its opportunity
+#               cost, a pain score histogram and, per question, a count of
+#               each answer with its pain score
+#
+# python aggregates.py rebuild assessments.db recomputes everything from the
+# stored rows, e.g. for a database created before aggregates existed.
+import json
+import sys
+from collections import defaultdict
+
+import diagnostic
+import scoring
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS aggregates (
+    app TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    PRIMARY KEY (app, dimension, bucket)
+)
+"""
+
+MATURITY_METRICS = ('total_annual_cost', 'risk_exposure', 'time_wasted')
+EXECUTIVE_METRICS = ('pain_score', 'opportunity_cost', 'investment', 'roi')
+# Lower bucket edges; bucket labels are the edge values
+COST_BINS = (0, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+PAIN_BINS = (0.0, 0.5, 1.0, 1.5, 2.0, 2.5)
+
+
+def _bucket(value, bins):
+    label = bins[0]
+    for edge in bins:
+        if value < edge:
+            break
+        label = edge
+    return str(label)
+
+
+def maturity_updates(answers, findings):
+    # (dimension, bucket, value) triples for one maturity assessment
+    updates = [('metric', metric, findings[metric]) for metric in MATURITY_METRICS]
+    updates.append(('total_annual_cost_histogram',
+                    _bucket(findings['total_annual_cost'], COST_BINS), findings['total_annual_cost']))
+    if 'full_reruns' in findings:
+        updates.append(('session', 'full_reruns', findings['full_reruns']))
+    for question_id, answer in answers.items():
+        if question_id in scoring.registry and answer.get('value'):
+            updates.append((f'option:{question_id}', answer['value'], findings['total_annual_cost']))
+    return updates
+
+
+def executive_updates(answers, result):
+    # (dimension, bucket, value) triples for one executive diagnostic
+    pain_score = float(result['pain_score'])
+    opportunity_cost = float(result['opportunity_cost'])
+    updates = [('metric', metric, float(result[metric])) for metric in EXECUTIVE_METRICS]
+    updates.append(('tier', diagnostic.diagnose_tier(pain_score), opportunity_cost))
+    updates.append(('pain_score_histogram', _bucket(pain_score, PAIN_BINS), pain_score))
+    for question_id in diagnostic.QUESTION_IDS:
+        if question_id in answers:
+            updates.append((f'option:{question_id}', answers[question_id], pain_score))
+    return updates
+
+
+_updaters = {
+    'maturity': maturity_updates,
+    'executive': executive_updates,
+}
+
+
+def updates_for(app, answers, results):
+    updater = _updaters.get(app)
+    return updater(answers, results) if updater else []
+
+
+def apply(connection, rows):
+    # rows: (app, dimension, bucket, value); pre-summed per key so a batch
+    # costs one upsert per distinct counter. Runs inside the caller's transaction.
+    totals = defaultdict(lambda: [0, 0.0])
+    for app, dimension, bucket, value in rows:
+        entry = totals[app, dimension, bucket]
+        entry[0] += 1
+        entry[1] += value
+    connection.executemany(
+        "INSERT INTO aggregates (app, dimension, bucket, count, total) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (app, dimension, bucket) DO UPDATE SET "
+        "count = count + excluded.count, total = total + excluded.total",
+        [(*key, count, total) for key, (count, total) in totals.items()])
+
+
+def read(connection, app=None):
+    # {app: {dimension: {bucket: {'count': n, 'total': sum}}}}
+    query = "SELECT app, dimension, bucket, count, total FROM aggregates"
+    rows = connection.execute(query + " WHERE app = ?", (app,)) if app else connection.execute(query)
+    result = {}
+    for row_app, dimension, bucket, count, total in rows:
+        result.setdefault(row_app, {}).setdefault(dimension, {})[bucket] = {'count': count, 'total': total}
+    return result
+
+
+def rebuild(connection):
+    # Recompute every counter from the stored assessments
+    with connection:
+        connection.execute("DELETE FROM aggregates")
+        rows = []
+        for app, answers, results in connection.execute("SELECT app, answers, results FROM assessments"):
+            for update in updates_for(app, json.loads(answers), json.loads(results)):
+                rows.append((app, *update))
+            if len(rows) >= 100_000:
+                apply(connection, rows)
+                rows = []
+        apply(connection, rows)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != 'rebuild':
+        sys.exit("usage: python aggregates.py rebuild assessments.db")
+    import assessment_store
+    rebuild(assessment_store.connect(sys.argv[2]))
@@ -0,0 +1,170 @@
+# Compact URL-safe tokens holding a maturity assessment in progress.
+# maturity.py keeps the token in the page URL (st.query_params), so a
+# reconnect, a reload or a different server process picks the assessment up
+# where it was, without sticky sessions or a shared session store.
+#
+# Layout, most significant bit first, padded with zero bits to whole bytes and
+# base64url-encoded without '=' padding:
+#   4 bits    VERSION
+#   3 bits    current question
+#   1 bit     report shown
+#   3 bits    per question: selected option position + 1 (0 = none)
+#   per follow-up, in question order:
+#     number  2-bit tag: none, whole number (varint) or any other float (64 bits)
+#     text    2-bit tag: never given, cleared or text; text is followed by a
+#             length byte and up to MAX_TEXT_BYTES of UTF-8
+# Varints are 7-bit groups, least significant first, each with a continuation
+# bit. A complete assessment with whole-number follow-ups is about 20 characters.
+import base64
+import binascii
+import math
+import struct
+
+import scoring
+from metrics import instrument
+
+VERSION = 1
+# Longer text follow-ups keep their first MAX_TEXT_BYTES bytes
+MAX_TEXT_BYTES = 255
+# Tokens longer than this are rejected before decoding
+MAX_TOKEN_LENGTH = 1024
+
+_OPTION_BITS = 3
+# Number and text follow-up tags
+_NONE, _WHOLE, _FLOAT = range(3)
+_ABSENT, _CLEARED, _TEXT = range(3)
+_MISSING = object()
+# Whole numbers up to here are exact as floats and go in a varint
+_MAX_WHOLE = 2 ** 53
+_number_questions = frozenset(q['id'] for q in scoring.questions if q['follow_up_type'] == 'number')
+_option_counts = tuple(len(scoring.registry[question_id].options) for question_id in scoring.QUESTION_IDS)
+
+
+class _BitWriter:
+
+    def __init__(self):
+        self.value = 0
+        self.length = 0
+
+    def write(self, field, width):
+        self.value = (self.value << width) | field
+        self.length += width
+
+    def write_varint(self, number):
+        while True:
+            group = number & 0x7f
+            number >>= 7
+            self.write(group | (0x80 if number else 0), 8)
+            if not number:
+                return
+
+    def to_bytes(self):
+        padding = -self.length % 8
+        return (self.value << padding).to_bytes((self.length + padding) // 8, 'big')
+
+
+class _BitReader:
+
+    def __init__(self, data):
+        self.value = int.from_bytes(data, 'big')
+        self.remaining = len(data) * 8
+
+    def read(self, width):
+        if width > self.remaining:
+            raise ValueError("answer token is truncated")
+        self.remaining -= width
+        return (self.value >> self.remaining) & ((1 << width) - 1)
+
+    def read_varint(self):
+        number = 0
+        for shift in range(0, 56, 7):
+            group = self.read(8)
+            number |= (group & 0x7f) << shift
+            if not group & 0x80:
+                return number
+        raise ValueError("answer token has an oversized number")
+
+
+@instrument('answer_token.encode')
+def encode(answers, current_question=0, show_report=False):
+    # Token for an AnswerRecord and the position in the assessment
+    bits = _BitWriter()
+    bits.write(VERSION, 4)
+    bits.write(current_question, 3)
+    bits.write(bool(show_report), 1)
+    for position in answers.options:
+        bits.write(position + 1, _OPTION_BITS)
+    for question_id in scoring.QUESTION_IDS:
+        if question_id in _number_questions:
+            number = answers.number(question_id)
+            if number is None:
+                bits.write(_NONE, 2)
+            elif number.is_integer() and 0 <= number < _MAX_WHOLE:
+                bits.write(_WHOLE, 2)
+                bits.write_varint(int(number))
+            else:
+                bits.write(_FLOAT, 2)
+                bits.write(int.from_bytes(struct.pack('>d', number), 'big'), 64)
+        else:
+            text = answers.text(question_id, _MISSING)
+            if text is _MISSING:
+                bits.write(_ABSENT, 2)
+            elif not text:
+                bits.write(_CLEARED, 2)
+            else:
+                text = text.encode('utf-8')[:MAX_TEXT_BYTES]
+                bits.write(_TEXT, 2)
+                bits.write(len(text), 8)
+                bits.write(int.from_bytes(text, 'big'), len(text) * 8)
+    return base64.urlsafe_b64encode(bits.to_bytes()).rstrip(b'=').decode('ascii')
+
+
+def decode(token):
+    # (AnswerRecord, current question, report shown) from a token; raises
+    # ValueError for a token that is malformed or from another version.
+    # The position is clamped to the first unanswered question, and the report
+    # is only shown for a complete assessment, as in the app's own navigation.
+    if len(token) > MAX_TOKEN_LENGTH:
+        raise ValueError("answer token is too long")
+    try:
+        data = base64.b64decode(token + '=' * (-len(token) % 4), altchars=b'-_', validate=True)
+    except (binascii.Error, UnicodeEncodeError):
+        raise ValueError("answer token is not base64url") from None
+    bits = _BitReader(data)
+    if bits.read(4) != VERSION:
+        raise ValueError("answer token is from another version")
+    current_question = bits.read(3)
+    show_report = bool(bits.read(1))
+    record = scoring.AnswerRecord()
+    for position, count in enumerate(_option_counts):
+        option = bits.read(_OPTION_BITS) - 1
+        if option >= count:
+            raise ValueError("answer token has an unknown option")
+        record.options[position] = option
+    for position, question_id in enumerate(scoring.QUESTION_IDS):
+        if question_id in _number_questions:
+            tag = bits.read(2)
+            if tag == _WHOLE:
+                record.numbers[position] = bits.read_varint()
+            elif tag == _FLOAT:
+                number = struct.unpack('>d', bits.read(64).to_bytes(8, 'big'))[0]
+                if not math.isfinite(number):
+                    raise ValueError("answer token has an invalid number")
+                record.numbers[position] = number
+            elif tag != _NONE:
+                raise ValueError("answer token has an invalid number")
+        else:
+            tag = bits.read(2)
+            if tag == _TEXT:
+                length = bits.read(8)
+                text = bits.read(length * 8).to_bytes(length, 'big')
+                # A text cut at MAX_TEXT_BYTES may end in a partial character
+                record.set_follow_up(question_id, text.decode('utf-8', errors='ignore'))
+            elif tag == _CLEARED:
+                record.set_follow_up(question_id, None)
+            elif tag != _ABSENT:
+                raise ValueError("answer token has an invalid text")
+    first_open = next((i for i, question_id in enumerate(scoring.QUESTION_IDS)
+                       if not record.is_answered(question_id)), len(scoring.QUESTION_IDS))
+    current_question = min(current_question, first_open, len(scoring.QUESTION_IDS) - 1)
+    return record, current_question, show_report and first_open == len(scoring.QUESTION_IDS)
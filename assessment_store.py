@@ -0,0 +1,154 @@
+# Write-behind persistence of completed assessments.
+# The apps hand completed assessments to submit(), which only enqueues them.
+# A background writer thread drains the queue in batches and commits each batch
+# in one SQLite (WAL mode) transaction, so one fsync covers many submits and a
+# rerun never waits on disk.
+#
+# Analytics counters (aggregates.py) are updated in the same transaction.
+#
+# The database path comes from ASSESSMENT_DB (default: assessments.db).
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import aggregates
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    answers TEXT NOT NULL,
+    results TEXT NOT NULL
+)
+"""
+
+
+def _json_default(value):
+    # NumPy values from the precomputed diagnostic table: structured rows become
+    # dicts, scalars become Python numbers
+    names = getattr(getattr(value, 'dtype', None), 'names', None)
+    if names:
+        return {name: value[name] for name in names}
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def connect(path):
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=FULL")
+    connection.execute(SCHEMA)
+    connection.execute(aggregates.SCHEMA)
+    return connection
+
+
+class AssessmentStore:
+
+    def __init__(self, path, batch_size=500, flush_interval=0.5, max_pending=10_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def submit(self, app, answers, results):
+        # Never blocks: when the writer is far behind, the record is dropped and counted
+        record = (app, time.time(),
+                  json.dumps(answers, default=_json_default),
+                  json.dumps(results, default=_json_default),
+                  aggregates.updates_for(app, answers, results))
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout=None):
+        # Wait until everything submitted so far is committed (or the timeout passes)
+        if self._writer is None:
+            return
+        if timeout is None:
+            self._queue.join()
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run, name='assessment-writer', daemon=True)
+                    self._writer.start()
+                    atexit.register(self.flush, 5)
+
+    def _next_batch(self):
+        # Wait for one record, then coalesce whatever arrives within flush_interval
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        connection = connect(self.path)
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write(connection, batch)
+            except sqlite3.Error:
+                # Keep the writer alive; the batch is lost but later submits still land
+                self.dropped += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, connection, batch):
+        with connection:
+            connection.executemany(
+                "INSERT INTO assessments (app, created_at, answers, results) VALUES (?, ?, ?, ?)",
+                [record[:4] for record in batch])
+            aggregates.apply(connection, [(record[0], *update) for record in batch for update in record[4]])
+        self.written += len(batch)
+        self.batches += 1
+
+    def stats(self):
+        return {
+            'pending': self._queue.qsize(),
+            'written': self.written,
+            'batches': self.batches,
+            'dropped': self.dropped,
+        }
+
+
+def database_path():
+    return os.environ.get('ASSESSMENT_DB', 'assessments.db')
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=None):
+    # One store (and writer thread) per database path, shared by all sessions
+    path = path or database_path()
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = AssessmentStore(path)
+        return _stores[path]
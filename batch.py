@@ -0,0 +1,231 @@
+# Vectorized batch scoring for the maturity assessment.
+# Takes one row per respondent and reproduces scoring.calculate_findings with
+# columnar NumPy operations, so historical responses can be re-scored in bulk
+# whenever the economic assumptions change.
+#
+# Expected columns, for each question id in scoring.registry:
+#   <id>            the selected option value (e.g. 'days', '6-10')
+#   <id>_follow_up  the follow-up answer as stored by the app (string or number)
+import numpy as np
+import pandas as pd
+
+import detailed_roi
+import diagnostic
+import scoring
+from scoring_config import get_config
+
+QUESTION_IDS = list(scoring.registry)
+HIGH_RISK = ('high', 'critical')
+# Follow-ups that calculate_findings truncates with int(float(...))
+INTEGER_FOLLOW_UPS = ('reporting_time', 'decision_speed')
+
+
+def follow_up_column(question_id):
+    return f"{question_id}_follow_up"
+
+
+def answers_frame(answer_sets):
+    # Flatten answers dicts (as kept in st.session_state.answers) into a frame
+    rows = []
+    for answers in answer_sets:
+        row = {}
+        for question_id in QUESTION_IDS:
+            answer = answers.get(question_id, {})
+            row[question_id] = answer.get('value')
+            row[follow_up_column(question_id)] = answer.get('follow_up')
+        rows.append(row)
+    return pd.DataFrame(rows, columns=[c for q in QUESTION_IDS for c in (q, follow_up_column(q))])
+
+
+def _option_codes(frame, question_id):
+    # Index of the selected option per row, -1 where missing or unknown
+    if question_id not in frame:
+        return np.full(len(frame), -1, dtype=np.int64)
+    values = [o.value for o in scoring.registry[question_id].options]
+    return pd.Categorical(frame[question_id], categories=values).codes.astype(np.int64)
+
+
+def _option_attribute(codes, question_id, key):
+    # Option attribute per row, NaN where the option is unknown or lacks the key.
+    # The trailing NaN slot is what code -1 indexes into.
+    options = scoring.registry[question_id].options
+    table = np.array([getattr(o, key) for o in options] + [None], dtype=float)
+    return table[codes]
+
+
+def compliance_exposure(codes, config):
+    # Configured exposure per row, NaN where the option carries none
+    options = scoring.registry['compliance_audit'].options
+    table = np.array([config.compliance_exposure.get(o.value) for o in options] + [None], dtype=float)
+    return table[codes]
+
+
+def _high_risk(codes, question_id):
+    options = scoring.registry[question_id].options
+    table = np.array([o.risk in HIGH_RISK for o in options] + [False])
+    return table[codes]
+
+
+def _parse_follow_up(follow_up):
+    # One stored follow-up, parsed as AnswerRecord.from_dict does
+    try:
+        return scoring._parse_number(follow_up) if follow_up else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _follow_up(frame, question_id):
+    # Parsed follow-up, NaN where the answer is missing, empty or not a finite
+    # number. Mirrors AnswerRecord.from_dict on the stored strings.
+    column = frame.get(follow_up_column(question_id))
+    if column is None:
+        return np.full(len(frame), np.nan)
+    if pd.api.types.is_numeric_dtype(column):
+        # A numeric 0 is falsy, so like an empty answer it counts as unanswered
+        values = column.to_numpy(dtype=float, na_value=np.nan)
+        return np.where((values == 0) | ~np.isfinite(values), np.nan, values)
+    # Follow-ups repeat heavily (round numbers), so parse each distinct value
+    # once; object columns may mix strings with numbers, e.g. loaded from JSON
+    codes, uniques = pd.factorize(column)
+    table = np.array([_parse_follow_up(follow_up) for follow_up in uniques] + [np.nan])
+    return table[codes]
+
+
+def encode_frame(frame):
+    # (codes, follow_ups), both shaped (N, len(QUESTION_IDS)). Codes are option
+    # indices with -1 for missing; follow-ups are parsed floats with NaN for missing.
+    codes = np.column_stack([_option_codes(frame, q) for q in QUESTION_IDS])
+    follow_ups = np.column_stack([_follow_up(frame, q) for q in QUESTION_IDS])
+    for question_id in INTEGER_FOLLOW_UPS:
+        column = QUESTION_IDS.index(question_id)
+        follow_ups[:, column] = np.trunc(follow_ups[:, column])
+    return codes, follow_ups
+
+
+def score_frame(frame,
+                reports_per_year=None,
+                avg_cost_per_hour=None,
+                avg_opportunity_value=None,
+                lost_opportunity_rate=None):
+    # Assumptions that are not passed come from the current scoring config
+    config = get_config()
+    if reports_per_year is None:
+        reports_per_year = config.reports_per_year
+    if avg_cost_per_hour is None:
+        avg_cost_per_hour = config.avg_cost_per_hour
+    if avg_opportunity_value is None:
+        avg_opportunity_value = config.avg_opportunity_value
+    if lost_opportunity_rate is None:
+        lost_opportunity_rate = config.lost_opportunity_rate
+    n = len(frame)
+    total_annual_cost = np.zeros(n)
+    time_wasted = np.zeros(n)
+    risk_exposure = np.zeros(n)
+    critical = {}
+
+    # Reporting time: hours per report x people x reports per year x hourly cost
+    codes = _option_codes(frame, 'reporting_time')
+    hours_per_report = _option_attribute(codes, 'reporting_time', 'cost')
+    people = np.trunc(_follow_up(frame, 'reporting_time'))
+    active = ~np.isnan(hours_per_report) & ~np.isnan(people)
+    annual_cost = hours_per_report * people * reports_per_year * avg_cost_per_hour
+    total_annual_cost += np.where(active, annual_cost, 0)
+    time_wasted += np.where(active, hours_per_report * reports_per_year, 0)
+    critical['reporting_time'] = active & _high_risk(codes, 'reporting_time')
+
+    # Manual work: weekly hours x 52 x hourly rate
+    codes = _option_codes(frame, 'manual_work')
+    weekly_hours = _option_attribute(codes, 'manual_work', 'hours')
+    hourly_rate = _follow_up(frame, 'manual_work')
+    active = ~np.isnan(weekly_hours) & ~np.isnan(hourly_rate)
+    annual_cost = weekly_hours * 52 * hourly_rate
+    total_annual_cost += np.where(active, annual_cost, 0)
+    time_wasted += np.where(active, weekly_hours * 52, 0)
+    critical['manual_work'] = active & (np.nan_to_num(weekly_hours) >= 15)
+
+    # Data accuracy: cost per incident x monthly incidents x 12
+    codes = _option_codes(frame, 'data_accuracy')
+    monthly_incidents = _option_attribute(codes, 'data_accuracy', 'frequency')
+    cost_per_incident = _follow_up(frame, 'data_accuracy')
+    active = ~np.isnan(monthly_incidents) & ~np.isnan(cost_per_incident)
+    annual_cost = cost_per_incident * monthly_incidents * 12
+    risk_exposure += np.where(active, annual_cost, 0)
+    critical['data_accuracy'] = active & _high_risk(codes, 'data_accuracy')
+
+    # Decision speed: lost opportunities x 12 x average opportunity value
+    codes = _option_codes(frame, 'decision_speed')
+    delay = _option_attribute(codes, 'decision_speed', 'delay')
+    opportunities_per_month = np.trunc(_follow_up(frame, 'decision_speed'))
+    active = ~np.isnan(delay) & ~np.isnan(opportunities_per_month)
+    annual_cost = opportunities_per_month * lost_opportunity_rate * 12 * avg_opportunity_value
+    risk_exposure += np.where(active, annual_cost, 0)
+    critical['decision_speed'] = active & _high_risk(codes, 'decision_speed')
+
+    # Data silos: integration hours x 52 x hourly cost
+    codes = _option_codes(frame, 'data_silos')
+    systems = _option_attribute(codes, 'data_silos', 'systems')
+    hours_per_week = _follow_up(frame, 'data_silos')
+    active = ~np.isnan(systems) & ~np.isnan(hours_per_week)
+    annual_cost = hours_per_week * 52 * avg_cost_per_hour
+    total_annual_cost += np.where(active, annual_cost, 0)
+    time_wasted += np.where(active, hours_per_week * 52, 0)
+    critical['data_silos'] = active & (np.nan_to_num(systems) >= 6)
+
+    # Compliance: fixed exposure per option, independent of the follow-up
+    codes = _option_codes(frame, 'compliance_audit')
+    exposure = compliance_exposure(codes, config)
+    active = ~np.isnan(exposure)
+    risk_exposure += np.where(active, exposure, 0)
+    critical['compliance_audit'] = active & _high_risk(codes, 'compliance_audit')
+
+    result = pd.DataFrame({
+        'total_annual_cost': total_annual_cost,
+        'risk_exposure': risk_exposure,
+        'time_wasted': time_wasted,
+    }, index=frame.index)
+    for question_id in QUESTION_IDS:
+        result[f"critical_{question_id}"] = critical[question_id]
+    result['critical_issue_count'] = np.sum([critical[q] for q in QUESTION_IDS], axis=0)
+    return result
+
+
+def diagnose_frame(frame, prefix=''):
+    # Executive diagnostic for a frame of answer labels, one column per
+    # diagnostic.QUESTION_IDS (optionally prefixed). Rows with a missing or
+    # unknown answer get NaN results.
+    codes = np.column_stack([
+        pd.Categorical(frame[prefix + question_id], categories=list(diagnostic.option_ordinals[question_id])).codes
+        for question_id in diagnostic.QUESTION_IDS
+    ])
+    valid = (codes >= 0).all(axis=1)
+    result = diagnostic.diagnose_encoded(codes[valid])
+    columns = {}
+    for name, values in result.items():
+        if values.dtype.kind == 'u':
+            # Integer flags stay integers, with <NA> for invalid rows
+            column = pd.array(np.zeros(len(frame), dtype=values.dtype), dtype=f"UInt{values.dtype.itemsize * 8}")
+            column[valid] = values
+            column[~valid] = pd.NA
+        else:
+            column = np.full(len(frame), np.nan)
+            column[valid] = values
+        columns[name] = column
+    return pd.DataFrame(columns, index=frame.index)
+
+
+def detailed_frame(frame, prefix=''):
+    # Detailed ROI for a frame of answer labels, one column per
+    # detailed_roi.QUESTION_IDS (optionally prefixed). Rows with a missing or
+    # unknown answer get NaN results.
+    codes = np.column_stack([
+        pd.Categorical(frame[prefix + question_id], categories=list(detailed_roi.option_ordinals[question_id])).codes
+        for question_id in detailed_roi.QUESTION_IDS
+    ])
+    valid = (codes >= 0).all(axis=1)
+    result = detailed_roi.score_encoded(codes[valid])
+    columns = {}
+    for name, values in result.items():
+        column = np.full(len(frame), np.nan)
+        column[valid] = values
+        columns[name] = column
+    return pd.DataFrame(columns, index=frame.index)
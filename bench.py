@@ -0,0 +1,199 @@
+# Reproducible performance benchmarks for both apps.
+# Covers scoring, report HTML construction, ROI figure building and cold
+# import time, writes the results as JSON and compares them with a stored
+# baseline so regressions are caught before deploy.
+#
+#   python bench.py --save-baseline      # record bench_baseline.json
+#   python bench.py                      # run, write bench_results.json, compare
+#   python bench.py --startup executive --budget-ms 600
+#                                        # per-package cold import cost vs a budget
+#
+# Exits with status 1 when any benchmark is slower than the baseline by more
+# than --tolerance, or when the startup total exceeds --budget-ms.
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from itertools import cycle
+
+import numpy as np
+
+import charts
+import diagnostic
+import projection
+import report
+import scoring
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SEED = 20240101
+SAMPLES = 1000
+
+
+def synthetic_answers(rng):
+    # One complete maturity assessment with round follow-up numbers
+    answers = {}
+    for question in scoring.questions:
+        option = rng.choice(question['options'])
+        if question['follow_up_type'] == 'number':
+            follow_up = str(rng.choice([1, 2, 3, 5, 8, 10, 15, 20, 50, 75, 100, 500, 1000, 5000]))
+        else:
+            follow_up = rng.choice(['SOX', 'GDPR', 'HIPAA', 'None'])
+        answers[question['id']] = {'value': option['value'], 'follow_up': follow_up}
+    return answers
+
+
+def synthetic_diagnostic(rng):
+    return {q['id']: rng.choice(q['options']) for q in diagnostic.pain_questions + [diagnostic.revenue_question]}
+
+
+def measure(func, inputs, repeat=5):
+    # Per-call time (median and min over `repeat` runs of ~0.2s each),
+    # cycling through the inputs
+    items = cycle(inputs)
+    timer = timeit.Timer(lambda: func(next(items)))
+    loops, _ = timer.autorange()
+    runs = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+    return {'median_us': statistics.median(runs) * 1e6, 'min_us': min(runs) * 1e6, 'loops': loops}
+
+
+def measure_import(module, repeat=5):
+    # Cold import in a fresh interpreter, net of bare interpreter startup
+    def run(code):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=HERE, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return time.perf_counter() - started
+
+    startup = statistics.median(run('pass') for _ in range(repeat))
+    runs = [run(f'import {module}') - startup for _ in range(repeat)]
+    return {'median_us': statistics.median(runs) * 1e6, 'min_us': min(runs) * 1e6, 'loops': 1}
+
+
+def startup_profile(module):
+    # Cold import cost in microseconds per top-level package, from -X importtime
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             cwd=HERE, check=True, capture_output=True, text=True)
+    costs = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        costs[package] = costs.get(package, 0) + int(self_us)
+    return costs
+
+
+def report_startup(module, budget_ms, top=15):
+    costs = startup_profile(module)
+    total_ms = sum(costs.values()) / 1000
+    print(f"cold import of {module}: {total_ms:.1f}ms")
+    for package, cost in sorted(costs.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {package:<30} {cost / 1000:>8.1f}ms")
+    if budget_ms is not None and total_ms > budget_ms:
+        print(f"over budget: {total_ms:.1f}ms > {budget_ms:.1f}ms")
+        return 1
+    return 0
+
+
+def benchmarks():
+    rng = random.Random(SEED)
+    answer_sets = [synthetic_answers(rng) for _ in range(SAMPLES)]
+    records = [scoring.AnswerRecord.from_dict(answers) for answers in answer_sets]
+    findings = [scoring.calculate_findings(answers) for answers in answer_sets]
+    encoded = [diagnostic.encode_answers(synthetic_diagnostic(rng)) for _ in range(SAMPLES)]
+    pain_scores = [(diagnostic.calculate_pain_score(e), diagnostic.revenue_question['bases'][e[-1]]) for e in encoded]
+    roi_inputs = [(diagnostic.calculate_opportunity_cost(p, r), diagnostic.calculate_investment(r))
+                  for p, r in pain_scores]
+    roi_batch = tuple(map(np.array, zip(*(roi_inputs * 10))))
+
+    return {
+        'scoring.calculate_findings': lambda: measure(scoring.calculate_findings, answer_sets),
+        'scoring.calculate_findings[record]': lambda: measure(scoring.calculate_findings, records),
+        'diagnostic.calculate_pain_score': lambda: measure(diagnostic.calculate_pain_score, encoded),
+        'diagnostic.calculate_opportunity_cost': lambda: measure(
+            lambda args: diagnostic.calculate_opportunity_cost(*args), pain_scores),
+        'report.build_report': lambda: measure(report.build_report, findings),
+        'projection.project[10k]': lambda: measure(lambda args: projection.project(*args), [roi_batch]),
+        'charts.build_roi_figure': lambda: measure(lambda args: charts.build_roi_figure(*args), roi_inputs),
+        'charts.build_roi_figure+to_json': lambda: measure(
+            lambda args: charts.build_roi_figure(*args).to_json(), roi_inputs),
+        # Every call misses the figure cache: projection, patching and SpecFigure construction
+        'charts.build_roi_figure[uncached]': lambda: measure(
+            lambda args: (charts._roi_figure.cache_clear(), charts.build_roi_figure(*args)), roi_inputs),
+        'import.maturity': lambda: measure_import('maturity'),
+        'import.executive': lambda: measure_import('executive'),
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"{'benchmark':<40} {'median':>12} {'baseline':>12} {'ratio':>7}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {result['median_us']:>10.1f}us {'-':>12} {'-':>7}")
+            continue
+        ratio = result['median_us'] / base['median_us']
+        flag = '  REGRESSION' if ratio > 1 + tolerance else ''
+        print(f"{name:<40} {result['median_us']:>10.1f}us {base['median_us']:>10.1f}us {ratio:>7.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks.")
+    parser.add_argument('--output', default=os.path.join(HERE, 'bench_results.json'))
+    parser.add_argument('--baseline', default=os.path.join(HERE, 'bench_baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown before a benchmark counts as a regression (default: 0.25)")
+    parser.add_argument('--only', help="run only benchmarks whose name contains this text")
+    parser.add_argument('--startup', metavar='MODULE',
+                        help="only report the per-package cold import cost of MODULE (e.g. executive)")
+    parser.add_argument('--budget-ms', type=float, help="with --startup, fail when the import takes longer")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        return report_startup(args.startup, args.budget_ms)
+
+    results = {}
+    for name, run in benchmarks().items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = run()
+
+    document = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': SEED,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(document, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# Plotly figures for executive.py, built without Streamlit so they can be
+# benchmarked and cached independently of the page.
+#
+# Most of a figure is identical on every render: the layout, the trace styling
+# and Plotly's default template, which is most of the serialized spec. That
+# part is built and validated once per horizon (_template), and each figure
+# only patches in its x/y arrays. Finished figures are memoized by
+# (opportunity, investment) rounded to QUANTUM dollars, so rendering a result
+# that was charted before costs a cache lookup.
+import functools
+
+import plotly.graph_objects as go
+
+import projection
+from metrics import instrument
+
+# Inputs are rounded to this many dollars before charting, well below what
+# the bars can show
+QUANTUM = 100
+# Memoized figures, about 45 KiB each
+CACHE_SIZE = 256
+# Projection series plotted by each template trace, in trace order
+SERIES = ('benefits', 'costs', 'net')
+
+
+class SpecFigure(go.Figure):
+    # Figure over an already validated spec. to_dict(), which st.plotly_chart
+    # and to_json() serialize, returns that spec instead of rebuilding it from
+    # the Plotly objects. Instances are shared between sessions and must not be
+    # modified.
+
+    def __init__(self, spec):
+        # Every part of the spec comes from a validated figure
+        super().__init__(spec, _validate=False)
+        self._spec = spec
+
+    def to_dict(self):
+        return self._spec
+
+
+@functools.cache
+def _template(years):
+    # Validated spec of the ROI figure without its y values
+    labels = [f'Year {year}' for year in range(1, years + 1)]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=labels,
+        y=[],
+        name='Annual Benefits',
+        marker_color='#38a169'
+    ))
+
+    fig.add_trace(go.Bar(
+        x=labels,
+        y=[],
+        name='Annual Investment',
+        marker_color='#e53e3e'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=labels,
+        y=[],
+        mode='lines+markers',
+        name='Net Benefit',
+        line=dict(color='#3182ce', width=3),
+        marker=dict(size=10)
+    ))
+
+    fig.update_layout(
+        title=f'{years}-Year ROI Projection',
+        xaxis_title='Year',
+        yaxis_title='Value ($)',
+        height=400,
+        plot_bgcolor='white',
+        showlegend=True
+    )
+
+    return fig.to_dict()
+
+
+def quantize(amount):
+    return round(amount / QUANTUM) * QUANTUM
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _roi_figure(opportunity, investment, years):
+    plan = projection.project(opportunity, investment, years)
+    template = _template(years)
+    # Traces are shallow copies sharing the template's x labels and styling
+    data = [dict(trace, y=plan[series][0]) for trace, series in zip(template['data'], SERIES)]
+    return SpecFigure({'data': data, 'layout': template['layout']})
+
+
+@instrument('charts.build_roi_figure')
+def build_roi_figure(opportunity, investment, years=projection.YEARS):
+    # Shared, read-only figure (see SpecFigure)
+    return _roi_figure(quantize(opportunity), quantize(investment), years)
@@ -0,0 +1,129 @@
+# Streamlit-free scoring for the detailed ROI mode of executive.py.
+# Each option carries the value it contributes, and answers are compiled into
+# ordinals the same way as diagnostic.py. Scoring is then NumPy table indexing,
+# so the same call scores one respondent (ordinals of shape (7,)) or a batch
+# of leads (shape (N, 7)).
+#
+# Annual opportunity = missed revenue recovered
+#                    + revenue_base * CHURN_RATE * share of churn preventable
+#                    + revenue_base * pricing lift
+#                    + productivity value of the team's time
+# Annual cost of the status quo = revenue_base * (decision speed cost + low confidence cost)
+# The investment uses the configured rate and minimum, like the quick diagnostic.
+import numpy as np
+
+import diagnostic
+from metrics import instrument
+from scoring_config import get_config
+
+# Typical annual churn, of which the churn_preventable answer can be saved
+CHURN_RATE = 0.15
+
+detailed_questions = [
+    {
+        'id': 'revenue_missed',
+        'question': "How much revenue slips away each month from missed follow-ups and opportunities?",
+        'options': ["Under $5K", "$5-25K", "$25-75K", "$75K+"],
+        # Annual revenue recovered
+        'values': [15_000, 50_000, 150_000, 300_000],
+    },
+    {
+        'id': 'churn_preventable',
+        'question': "How much of your customer churn could you prevent with earlier warning?",
+        'options': ["Under 10%", "10-25%", "25-50%", "50%+"],
+        # Share of CHURN_RATE saved
+        'values': [0.05, 0.175, 0.375, 0.6],
+    },
+    {
+        'id': 'pricing_opportunity',
+        'question': "How much revenue upside do you see from data-driven pricing?",
+        'options': ["Under 5%", "5-15%", "15-25%", "25%+"],
+        # Share of revenue gained
+        'values': [0.025, 0.1, 0.2, 0.3],
+    },
+    {
+        # Same question and labels as the quick diagnostic
+        'id': 'team_time',
+        'question': diagnostic.pain_question('team_time')['question'],
+        'options': diagnostic.pain_question('team_time')['options'],
+        # Annual productivity value
+        'values': [1_000_000, 500_000, 200_000, 50_000],
+    },
+    {
+        'id': 'decision_speed',
+        'question': diagnostic.pain_question('decision_speed')['question'],
+        'options': diagnostic.pain_question('decision_speed')['options'],
+        # Share of revenue lost to slow decisions
+        'values': [0.01, 0.005, 0.002, 0.0],
+    },
+    {
+        'id': 'data_confidence',
+        'question': "How confident are you in the data behind major decisions?",
+        'options': ["Low - mostly gut feel",
+                    "Moderate - some data gaps",
+                    "Confident - good data",
+                    "Very confident - data-driven"],
+        # Share of revenue lost to low confidence decisions
+        'values': [0.015, 0.008, 0.003, 0.0],
+    },
+]
+
+
+def detailed_question(question_id):
+    return next(q for q in detailed_questions if q['id'] == question_id)
+
+
+# Compiled question model, built once at import; revenue band last as in diagnostic.py
+QUESTION_IDS = [q['id'] for q in detailed_questions] + [diagnostic.revenue_question['id']]
+option_ordinals = {q['id']: {label: i for i, label in enumerate(q['options'])} for q in detailed_questions}
+option_ordinals['revenue_size'] = diagnostic.option_ordinals['revenue_size']
+option_values = {q['id']: np.array(q['values'], dtype=float) for q in detailed_questions}
+revenue_bases = np.array(diagnostic.revenue_question['bases'], dtype=float)
+
+
+def encode_answers(answers):
+    # Ordinals for QUESTION_IDS; answers is a dict of selected labels by question id
+    return tuple(option_ordinals[q][answers[q]] for q in QUESTION_IDS)
+
+
+# The calculations take option ordinals, as ints or integer arrays, and
+# revenue bases as floats or float arrays of the same shape.
+
+def calculate_opportunity(revenue_base, revenue_missed, churn_preventable, pricing_opportunity, team_time):
+    revenue_recovery = option_values['revenue_missed'][revenue_missed]
+    churn_value = revenue_base * CHURN_RATE * option_values['churn_preventable'][churn_preventable]
+    pricing_value = revenue_base * option_values['pricing_opportunity'][pricing_opportunity]
+    productivity_value = option_values['team_time'][team_time]
+    return revenue_recovery + churn_value + pricing_value + productivity_value
+
+
+def calculate_current_cost(revenue_base, decision_speed, data_confidence):
+    speed_cost = revenue_base * option_values['decision_speed'][decision_speed]
+    confidence_cost = revenue_base * option_values['data_confidence'][data_confidence]
+    return speed_cost + confidence_cost
+
+
+def score_encoded(encoded, config=None):
+    # Detailed results for encoded answers of shape (7,) or (N, 7), as arrays
+    config = config or get_config()
+    encoded = np.asarray(encoded)
+    columns = {question_id: encoded[..., i] for i, question_id in enumerate(QUESTION_IDS)}
+    revenue_base = revenue_bases[columns['revenue_size']]
+    opportunity = calculate_opportunity(revenue_base, columns['revenue_missed'], columns['churn_preventable'],
+                                        columns['pricing_opportunity'], columns['team_time'])
+    current_cost = calculate_current_cost(revenue_base, columns['decision_speed'], columns['data_confidence'])
+    investment = np.maximum(revenue_base * config.investment_rate, config.min_investment)
+    return {
+        'revenue_base': revenue_base,
+        'opportunity': opportunity,
+        'current_cost': current_cost,
+        'investment': investment,
+        'roi': ((opportunity - investment) / investment) * 100,
+        'payback_months': investment / (opportunity / 12),
+    }
+
+
+@instrument('detailed_roi.score')
+def score(answers):
+    # Detailed results for one answers dict keyed by question id, as floats
+    return {name: float(value) for name, value in score_encoded(encode_answers(answers)).items()}
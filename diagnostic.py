@@ -0,0 +1,227 @@
+# Streamlit-free scoring for the executive diagnostic (executive.py).
+# The question bank lists options in the order the form shows them, which is
+# also highest pain first: option index i scores 3 - i.
+#
+# Answers are compiled once at import into small integer ordinals per question,
+# so scoring is an integer-array reduction that works for one respondent or a
+# 2-D batch, and identical labels on different questions cannot collide.
+# NumPy is only imported by the batch functions; diagnose() for a single
+# submit is plain Python so executive.py starts without it.
+import functools
+from types import SimpleNamespace
+
+from metrics import instrument
+from scoring_config import get_config
+
+pain_questions = [
+    {
+        'id': 'customer_insight',
+        'question': "Can you predict which customers will churn next month?",
+        'options': ["No - we find out when they cancel",
+                    "Sometimes - we guess based on complaints",
+                    "Usually - we track some warning signs",
+                    "Yes - we have predictive models"]
+    },
+    {
+        'id': 'cross_sell',
+        'question': "Do you know which products to recommend to each customer?",
+        'options': ["No - we use generic recommendations",
+                    "Sometimes - based on purchase history",
+                    "Usually - we analyze customer segments",
+                    "Yes - personalized recommendations for each customer"]
+    },
+    {
+        'id': 'pricing_decisions',
+        'question': "How do you set your prices?",
+        'options': ["Fixed pricing or gut feeling",
+                    "Check competitors occasionally",
+                    "Regular market analysis",
+                    "Dynamic pricing based on real-time data"]
+    },
+    {
+        'id': 'decision_speed',
+        'question': "When opportunities arise, how fast can you analyze and act?",
+        'options': ["Days or weeks - need to gather data first",
+                    "Same day if we're lucky",
+                    "Within hours with some preparation",
+                    "Immediately - real-time dashboards ready"]
+    },
+    {
+        'id': 'team_time',
+        'question': "How much time do your people spend finding/cleaning data vs using it?",
+        'options': ["80% finding data, 20% analyzing",
+                    "60% finding data, 40% analyzing",
+                    "40% finding data, 60% analyzing",
+                    "20% finding data, 80% analyzing"]
+    },
+    {
+        'id': 'data_trust',
+        'question': "Do different departments get different numbers for the same metrics?",
+        'options': ["Always - creates confusion and arguments",
+                    "Often - we spend time reconciling differences",
+                    "Sometimes - mostly consistent",
+                    "Never - single source of truth"]
+    },
+    {
+        'id': 'missed_opportunities',
+        'question': "How often do you miss business opportunities due to slow insights?",
+        'options': ["Weekly - competitors beat us regularly",
+                    "Monthly - we're always catching up",
+                    "Quarterly - occasional misses",
+                    "Rarely - we're usually first to market"]
+    }
+]
+
+revenue_question = {
+    'id': 'revenue_size',
+    'question': "What's your annual revenue range?",
+    'options': ["$500K-$2M", "$2M-$5M", "$5M-$10M", "$10M+"],
+    'bases': [1_250_000, 3_500_000, 7_500_000, 12_000_000],
+    # Revenue range per band for simulation.py; the open-ended top band is
+    # capped so its log-uniform median stays near its base
+    'bounds': [(500_000, 2_000_000), (2_000_000, 5_000_000), (5_000_000, 10_000_000), (10_000_000, 15_000_000)],
+}
+
+# Problem callouts, in display order: (question id, triggering answers, message)
+problem_callouts = [
+    ('customer_insight', ["No - we find out when they cancel", "Sometimes - we guess based on complaints"],
+     "💸 **Customer Churn Blindness**: You're losing customers without knowing why or when"),
+    ('cross_sell', ["No - we use generic recommendations", "Sometimes - based on purchase history"],
+     "💸 **Missed Sales Opportunities**: Each customer interaction could generate more revenue"),
+    ('team_time', ["80% finding data, 20% analyzing", "60% finding data, 40% analyzing"],
+     "💸 **Team Inefficiency**: Your expensive talent is doing manual work instead of strategic analysis"),
+    ('data_trust', ["Always - creates confusion and arguments", "Often - we spend time reconciling differences"],
+     "💸 **Decision Paralysis**: Inconsistent data slows decisions and creates internal conflict"),
+]
+
+
+def pain_question(question_id):
+    return next(q for q in pain_questions if q['id'] == question_id)
+
+
+# Compiled question model, built once at import
+PAIN_QUESTION_IDS = [q['id'] for q in pain_questions]
+QUESTION_IDS = PAIN_QUESTION_IDS + [revenue_question['id']]
+option_ordinals = {q['id']: {label: i for i, label in enumerate(q['options'])}
+                   for q in pain_questions + [revenue_question]}
+pain_scores = tuple(tuple(len(q['options']) - 1 - i for i in range(len(q['options'])))
+                    for q in pain_questions)
+# (column in the encoded answers, per-ordinal trigger flags) for each problem callout
+_problem_triggers = [
+    (QUESTION_IDS.index(question_id),
+     tuple(label in triggers for label in pain_question(question_id)['options']))
+    for question_id, triggers, _ in problem_callouts
+]
+
+# (minimum pain score, diagnosis), most severe first
+DIAGNOSIS_TIERS = [
+    (2.5, "Data Crisis"),
+    (1.5, "Data Problems"),
+    (0.5, "Data Opportunities"),
+    (0.0, "Data Leaders"),
+]
+
+
+@functools.cache
+def _arrays():
+    # NumPy views of the compiled model, built on first batch use
+    import numpy as np
+    return SimpleNamespace(
+        np=np,
+        pain_scores=np.array(pain_scores),
+        pain_columns=np.arange(len(pain_questions)),
+        revenue_bases=np.array(revenue_question['bases']),
+        problem_triggers=[(column, np.array(triggered)) for column, triggered in _problem_triggers],
+    )
+
+
+def encode_answers(answers):
+    # Ordinals for QUESTION_IDS; answers is a dict of selected labels by question id
+    return tuple(option_ordinals[q][answers[q]] for q in QUESTION_IDS)
+
+
+@instrument('diagnostic.calculate_pain_score')
+def calculate_pain_score(encoded):
+    # Average pain score 0-3 (3 = highest pain) from encoded answers.
+    # Accepts one response of shape (7,) or (8,), or a batch of shape (N, 7) or (N, 8).
+    arrays = _arrays()
+    encoded = arrays.np.asarray(encoded)[..., :len(pain_questions)]
+    return arrays.pain_scores[arrays.pain_columns, encoded].sum(axis=-1) / len(pain_questions)
+
+
+def calculate_opportunity_cost(pain_score, revenue_base, config=None):
+    # Higher pain = higher opportunity cost; 1% to 8.5% of revenue at risk by default
+    config = config or get_config()
+    base_cost_percentage = config.base_cost_rate + (pain_score * config.pain_cost_rate)
+    return revenue_base * base_cost_percentage
+
+
+def get_revenue_base(annual_revenue):
+    return revenue_question['bases'][option_ordinals['revenue_size'][annual_revenue]]
+
+
+def calculate_investment(revenue_base, config=None):
+    # 0.4% of revenue, at least $15,000 by default
+    config = config or get_config()
+    return max(revenue_base * config.investment_rate, config.min_investment)
+
+
+def diagnose_tier(pain_score):
+    for threshold, diagnosis in DIAGNOSIS_TIERS:
+        if pain_score >= threshold:
+            return diagnosis
+    return DIAGNOSIS_TIERS[-1][1]
+
+
+def problem_flags(encoded):
+    # Bitmask over problem_callouts; bit i set when callout i applies
+    arrays = _arrays()
+    np = arrays.np
+    encoded = np.asarray(encoded)
+    flags = np.zeros(encoded.shape[:-1], dtype=np.uint8)
+    for bit, (column, triggered) in enumerate(arrays.problem_triggers):
+        flags |= triggered[encoded[..., column]].astype(np.uint8) << bit
+    return flags
+
+
+def problem_messages(flags):
+    return [message for bit, (_, _, message) in enumerate(problem_callouts) if flags & (1 << bit)]
+
+
+def _result(pain_score, opportunity_cost, investment, flags):
+    return {
+        'pain_score': pain_score,
+        'opportunity_cost': opportunity_cost,
+        'investment': investment,
+        'roi': ((opportunity_cost - investment) / investment) * 100,
+        'payback_months': investment / (opportunity_cost / 12),
+        'problem_flags': flags,
+    }
+
+
+def diagnose_encoded(encoded):
+    # Diagnostic results for encoded answers of shape (8,) or (N, 8), as arrays
+    arrays = _arrays()
+    encoded = arrays.np.asarray(encoded)
+    pain_score = calculate_pain_score(encoded)
+    revenue_base = arrays.revenue_bases[encoded[..., -1]]
+    config = get_config()
+    opportunity_cost = calculate_opportunity_cost(pain_score, revenue_base, config)
+    investment = arrays.np.maximum(revenue_base * config.investment_rate, config.min_investment)
+    return _result(pain_score, opportunity_cost, investment, problem_flags(encoded))
+
+
+@instrument('diagnostic.diagnose')
+def diagnose(answers):
+    # Full diagnostic result for one answers dict keyed by question id
+    encoded = encode_answers(answers)
+    pain_score = sum(pain_scores[q][encoded[q]] for q in range(len(pain_questions))) / len(pain_questions)
+    revenue_base = revenue_question['bases'][encoded[-1]]
+    config = get_config()
+    opportunity_cost = calculate_opportunity_cost(pain_score, revenue_base, config)
+    investment = calculate_investment(revenue_base, config)
+    flags = 0
+    for bit, (column, triggered) in enumerate(_problem_triggers):
+        if triggered[encoded[column]]:
+            flags |= 1 << bit
+    return _result(pain_score, opportunity_cost, investment, flags)
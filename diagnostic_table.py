@@ -0,0 +1,114 @@
+# Precomputed results for every possible executive diagnostic submission.
+# Seven 4-option pain questions plus the 4-option revenue band give 4^8 = 65,536
+# inputs, so the whole answer space fits in a small memory-mapped .npy file and a
+# submit becomes a single index lookup.
+#
+# Build:  python diagnostic_table.py diagnostic_table.npy
+# Serve:  DIAGNOSTIC_TABLE=diagnostic_table.npy streamlit run executive.py
+#
+# The table bakes in the scoring config it was built with. Its version is
+# written next to it (<path>.version) and get_table() stops serving the table
+# once the live config has a different version, so executive.py falls back to
+# scoring directly. While the table is stale get_table() re-reads the version
+# file, and maps the table again as soon as it has been rebuilt.
+import os
+import sys
+
+import numpy as np
+
+import diagnostic
+from scoring_config import get_config
+
+QUESTIONS = diagnostic.pain_questions + [diagnostic.revenue_question]
+OPTIONS_PER_QUESTION = 4
+TABLE_SIZE = OPTIONS_PER_QUESTION ** len(QUESTIONS)
+
+TABLE_DTYPE = np.dtype([
+    ('pain_score', '<f8'),
+    ('opportunity_cost', '<f8'),
+    ('investment', '<f8'),
+    ('roi', '<f8'),
+    ('payback_months', '<f8'),
+    ('problem_flags', 'u1'),
+])
+
+_loaded = {}
+
+
+def answer_index(answers):
+    # Row-major index over the question ordinals (revenue band varies fastest)
+    index = 0
+    for question_id in diagnostic.QUESTION_IDS:
+        index = index * OPTIONS_PER_QUESTION + diagnostic.option_ordinals[question_id][answers[question_id]]
+    return index
+
+
+def version_path(path):
+    return f"{path}.version"
+
+
+def build_table(path):
+    tmp_path = f"{path}.tmp"
+    version = get_config().version
+    table = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=TABLE_DTYPE, shape=(TABLE_SIZE,))
+    # Every encoded answer combination, in answer_index order
+    encoded = np.indices((OPTIONS_PER_QUESTION,) * len(QUESTIONS), dtype=np.int8).reshape(len(QUESTIONS), -1).T
+    result = diagnostic.diagnose_encoded(encoded)
+    for name in TABLE_DTYPE.names:
+        table[name] = result[name]
+    table.flush()
+    del table
+    os.replace(tmp_path, path)
+    with open(version_path(path), 'w', encoding='utf-8') as handle:
+        handle.write(version)
+    _loaded.pop(path, None)
+
+
+def load_table(path):
+    table = np.load(path, mmap_mode='r')
+    if table.dtype != TABLE_DTYPE or table.shape != (TABLE_SIZE,):
+        raise ValueError(f"{path} is not a diagnostic table (dtype {table.dtype}, shape {table.shape})")
+    return table
+
+
+def table_version(path):
+    # Config version the table was built with, None when unknown
+    try:
+        with open(version_path(path), encoding='utf-8') as handle:
+            return handle.read().strip()
+    except OSError:
+        return None
+
+
+def get_table(path=None):
+    # Table mapped once per process (and again after a rebuild); None when the
+    # lookup mode is not enabled or the table was built with a different
+    # scoring config
+    path = path or os.environ.get('DIAGNOSTIC_TABLE')
+    if not path:
+        return None
+    current = get_config().version
+    loaded = _loaded.get(path)
+    if loaded is None or loaded[1] != current:
+        # build_table writes the version file last, so a new version means the
+        # table next to it is complete
+        version = table_version(path)
+        if loaded is not None and version == loaded[1]:
+            return None
+        if not os.path.exists(path):
+            return None
+        loaded = _loaded[path] = (load_table(path), version)
+    table, version = loaded
+    return table if version == current else None
+
+
+def lookup(table, answers):
+    # Structured row; fields are read like a dict, e.g. row['roi']
+    return table[answer_index(answers)]
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else 'diagnostic_table.npy'
+    build_table(output)
+    print(f"Wrote {TABLE_SIZE:,} rows ({TABLE_SIZE * TABLE_DTYPE.itemsize:,} bytes) to {output}"
+          f" for scoring config {get_config().version}")
@@ -1,6 +1,15 @@
+import os
+
 import streamlit as st
-import plotly.graph_objects as go
-import numpy as np
+
+import diagnostic
+import metrics
+from assessment_store import get_store
+from metrics import instrument
+
+# Heavy or optional modules (plotly via charts, NumPy via diagnostic_table and
+# percentiles) are imported on first use so a cold script run only pays for what
+# it renders.
 
 # Page configuration
 st.set_page_config(
@@ -9,6 +18,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Serves or dumps the metrics registry when METRICS_PORT / METRICS_FILE is set
+metrics.start_exporter()
+
 # Clean styling
 st.markdown("""
 <style>
@@ -41,9 +53,16 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+QUICK_MODE = "Quick diagnostic"
+DETAILED_MODE = "Detailed ROI"
+
 def main():
     st.title("Data-Driven Business Health Check")
     st.markdown("**Discover what your current data situation is really costing you**")
+    mode = st.radio("Assessment", [QUICK_MODE, DETAILED_MODE], horizontal=True, label_visibility="collapsed")
+    if mode == DETAILED_MODE:
+        detailed_form()
+        return
     st.markdown("Answer 8 simple questions to see how much revenue you're leaving on the table")
     st.markdown("---")
     
@@ -57,129 +76,144 @@ def main():
             # Customer relationship questions
             st.markdown("**Customer Relationships & Sales**")
             
-            customer_insight = st.selectbox(
-                "Can you predict which customers will churn next month?",
-                ["No - we find out when they cancel", 
-                 "Sometimes - we guess based on complaints",
-                 "Usually - we track some warning signs", 
-                 "Yes - we have predictive models"])
-            
-            cross_sell = st.selectbox(
-                "Do you know which products to recommend to each customer?",
-                ["No - we use generic recommendations", 
-                 "Sometimes - based on purchase history",
-                 "Usually - we analyze customer segments", 
-                 "Yes - personalized recommendations for each customer"])
-            
-            pricing_decisions = st.selectbox(
-                "How do you set your prices?",
-                ["Fixed pricing or gut feeling", 
-                 "Check competitors occasionally",
-                 "Regular market analysis", 
-                 "Dynamic pricing based on real-time data"])
-            
-            decision_speed = st.selectbox(
-                "When opportunities arise, how fast can you analyze and act?",
-                ["Days or weeks - need to gather data first", 
-                 "Same day if we're lucky",
-                 "Within hours with some preparation", 
-                 "Immediately - real-time dashboards ready"])
+            customer_insight = pain_select('customer_insight')
+            cross_sell = pain_select('cross_sell')
+            pricing_decisions = pain_select('pricing_decisions')
+            decision_speed = pain_select('decision_speed')
         
         with col2:
             # Operational efficiency questions
             st.markdown("**Operational Efficiency**")
             
-            team_time = st.selectbox(
-                "How much time do your people spend finding/cleaning data vs using it?",
-                ["80% finding data, 20% analyzing", 
-                 "60% finding data, 40% analyzing",
-                 "40% finding data, 60% analyzing", 
-                 "20% finding data, 80% analyzing"])
-            
-            data_trust = st.selectbox(
-                "Do different departments get different numbers for the same metrics?",
-                ["Always - creates confusion and arguments", 
-                 "Often - we spend time reconciling differences",
-                 "Sometimes - mostly consistent", 
-                 "Never - single source of truth"])
-            
-            missed_opportunities = st.selectbox(
-                "How often do you miss business opportunities due to slow insights?",
-                ["Weekly - competitors beat us regularly", 
-                 "Monthly - we're always catching up",
-                 "Quarterly - occasional misses", 
-                 "Rarely - we're usually first to market"])
+            team_time = pain_select('team_time')
+            data_trust = pain_select('data_trust')
+            missed_opportunities = pain_select('missed_opportunities')
             
             revenue_size = st.selectbox(
-                "What's your annual revenue range?",
-                ["$500K-$2M", "$2M-$5M", "$5M-$10M", "$10M+"])
+                diagnostic.revenue_question['question'],
+                diagnostic.revenue_question['options'])
         
+        simulate = st.checkbox("Show a likely range (simulate 1,000,000 scenarios)",
+                               help="Varies revenue within your band and the cost and investment assumptions")
         diagnose = st.form_submit_button("Diagnose My Data Problems", use_container_width=True)
         
         if diagnose:
-            # Calculate the "pain score" and missed opportunities
-            pain_score = calculate_pain_score(customer_insight, cross_sell, pricing_decisions, 
-                                            decision_speed, team_time, data_trust, missed_opportunities)
+            answers = {
+                'customer_insight': customer_insight,
+                'cross_sell': cross_sell,
+                'pricing_decisions': pricing_decisions,
+                'decision_speed': decision_speed,
+                'team_time': team_time,
+                'data_trust': data_trust,
+                'missed_opportunities': missed_opportunities,
+                'revenue_size': revenue_size
+            }
             
-            revenue_base = get_revenue_base(revenue_size)
-            opportunity_cost = calculate_opportunity_cost(pain_score, revenue_base)
+            # Use the precomputed table when it is enabled, otherwise score directly
+            if os.environ.get('DIAGNOSTIC_TABLE'):
+                import diagnostic_table
+                table = diagnostic_table.get_table()
+            else:
+                table = None
+            if table is not None:
+                result = diagnostic_table.lookup(table, answers)
+            else:
+                result = diagnostic.diagnose(answers)
             
-            display_diagnostic_results(pain_score, opportunity_cost, revenue_base, 
-                                     customer_insight, cross_sell, team_time, data_trust)
+            # Queued for the background writer so the page renders without waiting on disk
+            get_store().submit('executive', answers, result)
+            display_diagnostic_results(result, revenue_size)
+            if simulate:
+                display_simulation(result, revenue_size)
 
-def calculate_pain_score(customer_insight, cross_sell, pricing_decisions, decision_speed, 
-                        team_time, data_trust, missed_opportunities):
-    # Convert answers to pain points (higher = more pain)
-    scores = []
-    
-    # Each answer gets scored 0-3 (3 = highest pain)
-    answer_maps = {
-        customer_insight: {"Yes - we have predictive models": 0, "Usually - we track some warning signs": 1, 
-                          "Sometimes - we guess based on complaints": 2, "No - we find out when they cancel": 3},
-        cross_sell: {"Yes - personalized recommendations for each customer": 0, "Usually - we analyze customer segments": 1,
-                    "Sometimes - based on purchase history": 2, "No - we use generic recommendations": 3},
-        pricing_decisions: {"Dynamic pricing based on real-time data": 0, "Regular market analysis": 1,
-                           "Check competitors occasionally": 2, "Fixed pricing or gut feeling": 3},
-        decision_speed: {"Immediately - real-time dashboards ready": 0, "Within hours with some preparation": 1,
-                        "Same day if we're lucky": 2, "Days or weeks - need to gather data first": 3},
-        team_time: {"20% finding data, 80% analyzing": 0, "40% finding data, 60% analyzing": 1,
-                   "60% finding data, 40% analyzing": 2, "80% finding data, 20% analyzing": 3},
-        data_trust: {"Never - single source of truth": 0, "Sometimes - mostly consistent": 1,
-                    "Often - we spend time reconciling differences": 2, "Always - creates confusion and arguments": 3},
-        missed_opportunities: {"Rarely - we're usually first to market": 0, "Quarterly - occasional misses": 1,
-                              "Monthly - we're always catching up": 2, "Weekly - competitors beat us regularly": 3}
-    }
-    
-    for answer, score_map in answer_maps.items():
-        scores.append(score_map[answer])
+def detailed_form():
+    # Imported here so the quick diagnostic starts without NumPy
+    import detailed_roi
+    st.markdown("Answer 7 questions for a detailed estimate of what better data would return")
+    st.markdown("---")
     
-    return sum(scores) / len(scores)  # Average pain score 0-3
+    with st.form("detailed_roi"):
+        st.subheader("What Could Better Data Return?")
+        
+        answers = {}
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Revenue & Customers**")
+            answers['revenue_size'] = st.selectbox(
+                diagnostic.revenue_question['question'],
+                diagnostic.revenue_question['options'],
+                key='detailed_revenue_size')
+            for question_id in ('revenue_missed', 'churn_preventable', 'pricing_opportunity'):
+                answers[question_id] = detailed_select(detailed_roi, question_id)
+        
+        with col2:
+            st.markdown("**Team & Decisions**")
+            for question_id in ('team_time', 'decision_speed', 'data_confidence'):
+                answers[question_id] = detailed_select(detailed_roi, question_id)
+        
+        calculate = st.form_submit_button("Calculate My ROI", use_container_width=True)
+        
+        if calculate:
+            result = detailed_roi.score(answers)
+            get_store().submit('executive_detailed', answers, result)
+            display_results(result['opportunity'], result['current_cost'], result['investment'],
+                            result['revenue_base'])
 
-def calculate_opportunity_cost(pain_score, revenue_base):
-    # Higher pain = higher opportunity cost
-    base_cost_percentage = 0.01 + (pain_score * 0.025)  # 1% to 8.5% of revenue at risk
-    return revenue_base * base_cost_percentage
+def detailed_select(detailed_roi, question_id):
+    question = detailed_roi.detailed_question(question_id)
+    # Keyed apart from the quick form, which asks two of the same questions
+    return st.selectbox(question['question'], question['options'], key=f'detailed_{question_id}')
 
-def display_diagnostic_results(pain_score, opportunity_cost, revenue_base, 
-                             customer_insight, cross_sell, team_time, data_trust):
+def display_peer_rank(opportunity_cost, revenue_size):
+    import percentiles
+    share = percentiles.get_peer_index().percentile(
+        'executive', 'opportunity_cost', opportunity_cost, group=revenue_size)
+    if share is not None:
+        st.caption(f"Your revenue at risk is higher than {share:.0f}% of companies in the {revenue_size} band")
+
+@instrument('executive.display_simulation')
+def display_simulation(result, revenue_size):
+    # Imported here so only respondents who ask for the range load NumPy
+    import simulation
+    summary = simulation.roi_summary(result['pain_score'], revenue_size)
+    roi = summary['roi']
+    payback = summary['payback_months']
+    st.subheader("Likely Range")
+    st.caption(f"{summary['draws']:,} simulated scenarios: revenue anywhere in the {revenue_size} band, "
+               "uncertain cost of the status quo and investment")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("First-Year ROI (median)", f"{roi[1]:,.0f}%")
+        st.caption(f"80% of scenarios between {roi[0]:,.0f}% and {roi[2]:,.0f}%")
+    with col2:
+        st.metric("Payback (median)", f"{payback[1]:.1f} months")
+        st.caption(f"80% of scenarios between {payback[0]:.1f} and {payback[2]:.1f} months")
+
+def pain_select(question_id):
+    question = diagnostic.pain_question(question_id)
+    return st.selectbox(question['question'], question['options'])
+
+@instrument('executive.display_diagnostic_results')
+def display_diagnostic_results(result, revenue_size=None):
+    pain_score = result['pain_score']
+    opportunity_cost = result['opportunity_cost']
+    
     st.markdown("---")
     
     # Dramatic revelation of the problem
-    if pain_score >= 2.5:
+    diagnosis = diagnostic.diagnose_tier(pain_score)
+    if diagnosis == "Data Crisis":
         st.error("🚨 CRITICAL: Your data situation is costing you serious money")
-        diagnosis = "Data Crisis"
         color = "#e53e3e"
-    elif pain_score >= 1.5:
+    elif diagnosis == "Data Problems":
         st.warning("⚠️ WARNING: Significant revenue leakage from data gaps")
-        diagnosis = "Data Problems"
         color = "#d69e2e"
-    elif pain_score >= 0.5:
+    elif diagnosis == "Data Opportunities":
         st.info("ℹ️ OPPORTUNITY: Good foundation, but leaving money on the table")
-        diagnosis = "Data Opportunities"
         color = "#3182ce"
     else:
         st.success("✅ STRONG: You're ahead of most companies in data maturity")
-        diagnosis = "Data Leaders"
         color = "#38a169"
     
     # Show the financial impact
@@ -199,24 +233,15 @@ def display_diagnostic_results(pain_score, opportunity_cost, revenue_base,
         st.markdown(f'<div class="big-metric" style="color: {color};">${daily_cost:,.0f}</div>', unsafe_allow_html=True)
         st.markdown('<div class="metric-label">Daily Revenue Loss</div>', unsafe_allow_html=True)
     
+    if revenue_size:
+        display_peer_rank(opportunity_cost, revenue_size)
+    
     st.markdown("---")
     
     # Specific problem callouts
     st.subheader("Here's What's Costing You Money Right Now:")
     
-    problems = []
-    
-    if customer_insight in ["No - we find out when they cancel", "Sometimes - we guess based on complaints"]:
-        problems.append("💸 **Customer Churn Blindness**: You're losing customers without knowing why or when")
-    
-    if cross_sell in ["No - we use generic recommendations", "Sometimes - based on purchase history"]:
-        problems.append("💸 **Missed Sales Opportunities**: Each customer interaction could generate more revenue")
-    
-    if team_time in ["80% finding data, 20% analyzing", "60% finding data, 40% analyzing"]:
-        problems.append("💸 **Team Inefficiency**: Your expensive talent is doing manual work instead of strategic analysis")
-    
-    if data_trust in ["Always - creates confusion and arguments", "Often - we spend time reconciling differences"]:
-        problems.append("💸 **Decision Paralysis**: Inconsistent data slows decisions and creates internal conflict")
+    problems = diagnostic.problem_messages(result['problem_flags'])
     
     for problem in problems[:3]:  # Show top 3 problems
         st.markdown(problem)
@@ -257,9 +282,8 @@ def display_diagnostic_results(pain_score, opportunity_cost, revenue_base,
         """, unsafe_allow_html=True)
     
     # ROI calculation
-    # investment = revenue_base * 0.003
-    investment = max(revenue_base * 0.004, 15_000)  # 0.4% of revenue, minimum $15K
-    roi = ((opportunity_cost - investment) / investment) * 100
+    investment = result['investment']
+    roi = result['roi']
     
     st.markdown(f"""
     <div class="highlight-box">
@@ -267,51 +291,11 @@ def display_diagnostic_results(pain_score, opportunity_cost, revenue_base,
         <p><strong>Investment needed:</strong> ${investment:,.0f} (0.3% of revenue)</p>
         <p><strong>Annual benefit:</strong> ${opportunity_cost:,.0f}</p>
         <p><strong>ROI:</strong> {roi:.0f}% in first year</p>
-        <p><strong>Payback:</strong> {(investment / (opportunity_cost / 12)):.1f} months</p>
+        <p><strong>Payback:</strong> {result['payback_months']:.1f} months</p>
     </div>
     """, unsafe_allow_html=True)
 
-def get_revenue_base(annual_revenue):
-    revenue_map = {
-        "$500K-$2M": 1_250_000,
-        "$2M-$5M": 3_500_000, 
-        "$5M-$10M": 7_500_000,
-        "$10M+": 12_000_000
-    }
-    return revenue_map[annual_revenue]
-
-def calculate_opportunity(revenue_base, revenue_missed, churn_preventable, pricing_opportunity, team_time):
-    # Revenue recovery
-    missed_map = {"Under $5K": 15_000, "$5-25K": 50_000, "$25-75K": 150_000, "$75K+": 300_000}
-    revenue_recovery = missed_map[revenue_missed]
-    
-    # Churn prevention 
-    churn_map = {"Under 10%": 0.05, "10-25%": 0.175, "25-50%": 0.375, "50%+": 0.6}
-    churn_value = revenue_base * 0.15 * churn_map[churn_preventable]  # 15% typical churn, % preventable
-    
-    # Pricing optimization
-    pricing_map = {"Under 5%": 0.025, "5-15%": 0.1, "15-25%": 0.2, "25%+": 0.3}
-    pricing_value = revenue_base * pricing_map[pricing_opportunity]
-    
-    # Productivity gains
-    time_map = {"20% gathering, 80% analyzing": 50_000, "40% gathering, 60% analyzing": 200_000,
-               "60% gathering, 40% analyzing": 500_000, "80% gathering, 20% analyzing": 1_000_000}
-    productivity_value = time_map[team_time]
-    
-    return revenue_recovery + churn_value + pricing_value + productivity_value
-
-def calculate_current_cost(revenue_base, decision_speed, data_confidence):
-    # Cost of slow decisions
-    speed_map = {"Within hours": 0, "Same day": 0.002, "2-3 days": 0.005, "1+ weeks": 0.01}
-    speed_cost = revenue_base * speed_map[decision_speed]
-    
-    # Cost of low confidence decisions
-    confidence_map = {"Very confident - data-driven": 0, "Confident - good data": 0.003,
-                     "Moderate - some data gaps": 0.008, "Low - mostly gut feel": 0.015}
-    confidence_cost = revenue_base * confidence_map[data_confidence]
-    
-    return speed_cost + confidence_cost
-
+@instrument('executive.display_results')
 def display_results(opportunity, current_cost, investment, revenue_base):
     st.markdown("---")
     st.header("Your Data Engineering ROI")
@@ -367,15 +351,21 @@ def display_results(opportunity, current_cost, investment, revenue_base):
         """, unsafe_allow_html=True)
     
     # Investment summary
+    import projection
+    plan = projection.project(opportunity, investment)
+    
     st.subheader("Investment Summary")
     
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Initial Investment", f"${investment:,.0f}")
     with col2:
-        st.metric("Annual Support", f"${investment * 0.25:,.0f}")
+        st.metric("Annual Support", f"${investment * projection.SUPPORT_RATE:,.0f}")
     with col3:
-        st.metric("3-Year Net Benefit", f"${(opportunity * 3 - investment * 1.5):,.0f}")
+        st.metric(f"{projection.YEARS}-Year Net Benefit", f"${plan['cumulative'][0, -1]:,.0f}")
+        irr = plan['irr'][0]
+        st.caption(f"NPV at {projection.DISCOUNT_RATE:.0%}: ${plan['npv'][0]:,.0f}"
+                   + (f"  •  IRR: {irr:,.0%}" if irr == irr else ""))
     
     # Simple projection chart
     create_roi_chart(opportunity, investment)
@@ -397,46 +387,11 @@ def display_results(opportunity, current_cost, investment, revenue_base):
     </div>
     """, unsafe_allow_html=True)
 
+# Includes build_roi_figure; the rest is Plotly serialization in st.plotly_chart
+@instrument('executive.create_roi_chart')
 def create_roi_chart(opportunity, investment):
-    years = ['Year 1', 'Year 2', 'Year 3']
-    benefits = [opportunity, opportunity * 1.1, opportunity * 1.2]
-    costs = [investment, investment * 0.25, investment * 0.25]
-    net = [b - c for b, c in zip(benefits, costs)]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=years,
-        y=benefits,
-        name='Annual Benefits',
-        marker_color='#38a169'
-    ))
-    
-    fig.add_trace(go.Bar(
-        x=years,
-        y=costs,
-        name='Annual Investment',
-        marker_color='#e53e3e'
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=years,
-        y=net,
-        mode='lines+markers',
-        name='Net Benefit',
-        line=dict(color='#3182ce', width=3),
-        marker=dict(size=10)
-    ))
-    
-    fig.update_layout(
-        title='3-Year ROI Projection',
-        xaxis_title='Year',
-        yaxis_title='Value ($)',
-        height=400,
-        plot_bgcolor='white',
-        showlegend=True
-    )
-    
+    import charts
+    fig = charts.build_roi_figure(opportunity, investment)
     st.plotly_chart(fig, use_container_width=True)
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+# Closed-form linear model of the maturity findings.
+# Once the options are fixed, every contribution in scoring.calculate_findings is
+# affine in the question's follow-up number (people x hours x 52 x 75,
+# hourly_rate x weekly_hours x 52, ...). The question bank therefore compiles into
+# two coefficient tensors indexed by (question, option, output metric):
+#
+#   metric = sum over questions of  slope[q, option_q, m] * follow_up_q
+#                                  + intercept[q, option_q, m]
+#
+# so one respondent is a dot product and N respondents are one matrix multiply.
+# The slopes are also the analytic partial derivatives used in sensitivity reports.
+# Results match calculate_findings up to floating-point summation order.
+import numpy as np
+import pandas as pd
+
+import batch
+import scoring
+from scoring_config import get_config
+
+METRICS = ('total_annual_cost', 'risk_exposure', 'time_wasted')
+QUESTION_IDS = batch.QUESTION_IDS
+MAX_OPTIONS = max(len(q.options) for q in scoring.registry.values())
+# Questions whose contribution does not depend on a numeric follow-up answer
+UNGATED = ('compliance_audit',)
+
+_COST, _RISK, _TIME = range(len(METRICS))
+_ungated = np.array([q in UNGATED for q in QUESTION_IDS])
+
+
+def compile_coefficients(reports_per_year=None,
+                         avg_cost_per_hour=None,
+                         avg_opportunity_value=None,
+                         lost_opportunity_rate=None,
+                         config=None):
+    # Assumptions that are not passed come from the config (default: the current one)
+    config = config or get_config()
+    if reports_per_year is None:
+        reports_per_year = config.reports_per_year
+    if avg_cost_per_hour is None:
+        avg_cost_per_hour = config.avg_cost_per_hour
+    if avg_opportunity_value is None:
+        avg_opportunity_value = config.avg_opportunity_value
+    if lost_opportunity_rate is None:
+        lost_opportunity_rate = config.lost_opportunity_rate
+    shape = (len(QUESTION_IDS), MAX_OPTIONS, len(METRICS))
+    slopes = np.zeros(shape)
+    intercepts = np.zeros(shape)
+
+    def options(question_id):
+        return QUESTION_IDS.index(question_id), enumerate(scoring.registry[question_id].options)
+
+    q, indexed = options('reporting_time')
+    for o, option in indexed:
+        if option.cost is not None:
+            slopes[q, o, _COST] = option.cost * reports_per_year * avg_cost_per_hour
+            intercepts[q, o, _TIME] = option.cost * reports_per_year
+
+    q, indexed = options('manual_work')
+    for o, option in indexed:
+        if option.hours is not None:
+            slopes[q, o, _COST] = option.hours * 52
+            intercepts[q, o, _TIME] = option.hours * 52
+
+    q, indexed = options('data_accuracy')
+    for o, option in indexed:
+        if option.frequency is not None:
+            slopes[q, o, _RISK] = option.frequency * 12
+
+    q, indexed = options('decision_speed')
+    for o, option in indexed:
+        if option.delay is not None:
+            slopes[q, o, _RISK] = lost_opportunity_rate * 12 * avg_opportunity_value
+
+    q, indexed = options('data_silos')
+    for o, option in indexed:
+        if option.systems is not None:
+            slopes[q, o, _COST] = 52 * avg_cost_per_hour
+            slopes[q, o, _TIME] = 52
+
+    q, indexed = options('compliance_audit')
+    for o, option in indexed:
+        exposure = config.compliance_exposure.get(option.value)
+        if exposure is not None:
+            intercepts[q, o, _RISK] = exposure
+
+    return slopes, intercepts
+
+
+# (config version, (slopes, intercepts)) for the last config compiled
+_compiled = (None, None)
+
+
+def coefficients():
+    # (slopes, intercepts) for the current scoring config, compiled once per
+    # config version so scoring follows config reloads
+    global _compiled
+    config = get_config()
+    version, compiled = _compiled
+    if version != config.version:
+        compiled = compile_coefficients(config=config)
+        _compiled = (config.version, compiled)
+    return compiled
+
+
+def _active(codes, follow_ups):
+    # A question contributes when an option is selected and, unless ungated,
+    # its follow-up was answered with a finite number, as in AnswerRecord
+    return (codes >= 0) & (np.isfinite(follow_ups) | _ungated)
+
+
+def design_matrix(codes, follow_ups):
+    # (N, Q * O * 2) features: [follow-up, 1] placed in the selected option's slot
+    n, questions = codes.shape
+    active = _active(codes, follow_ups)
+    features = np.zeros((n, questions, MAX_OPTIONS, 2))
+    rows = np.arange(n)[:, None]
+    columns = np.arange(questions)[None, :]
+    slots = codes.clip(min=0)
+    features[rows, columns, slots, 0] = np.where(active & ~_ungated, follow_ups, 0)
+    features[rows, columns, slots, 1] = active
+    return features.reshape(n, -1)
+
+
+def weight_matrix(slopes=None, intercepts=None):
+    # (Q * O * 2, M), laid out to match design_matrix; coefficients default to
+    # the current config's
+    if slopes is None or intercepts is None:
+        slopes, intercepts = coefficients()
+    return np.stack([slopes, intercepts], axis=2).reshape(-1, len(METRICS))
+
+
+def score(codes, follow_ups, slopes=None, intercepts=None, chunk_size=65_536):
+    # Metrics for one respondent (shape (Q,)) or N respondents (shape (N, Q)).
+    # Rows are processed in chunks to bound the size of the design matrix.
+    codes = np.asarray(codes)
+    follow_ups = np.asarray(follow_ups, dtype=float)
+    single = codes.ndim == 1
+    codes, follow_ups = np.atleast_2d(codes), np.atleast_2d(follow_ups)
+    weights = weight_matrix(slopes, intercepts)
+    result = np.empty((len(codes), len(METRICS)))
+    for start in range(0, len(codes), chunk_size):
+        stop = start + chunk_size
+        result[start:stop] = design_matrix(codes[start:stop], follow_ups[start:stop]) @ weights
+    return result[0] if single else result
+
+
+def sensitivities(codes, follow_ups, slopes=None):
+    # d metric / d follow-up for each question, shape (..., Q, M); zero where
+    # the question does not contribute
+    if slopes is None:
+        slopes = coefficients()[0]
+    codes = np.asarray(codes)
+    follow_ups = np.asarray(follow_ups, dtype=float)
+    active = _active(codes, follow_ups) & ~_ungated
+    partials = slopes[np.arange(codes.shape[-1]), codes.clip(min=0)]
+    return partials * active[..., None]
+
+
+def score_frame(frame, **constants):
+    codes, follow_ups = batch.encode_frame(frame)
+    slopes, intercepts = compile_coefficients(**constants) if constants else coefficients()
+    return pd.DataFrame(score(codes, follow_ups, slopes, intercepts), columns=METRICS, index=frame.index)
+
+
+def sensitivity_frame(frame, **constants):
+    # One column per (metric, question): change in the metric per unit of that
+    # question's follow-up answer, e.g. total_annual_cost_per_manual_work
+    codes, follow_ups = batch.encode_frame(frame)
+    slopes = compile_coefficients(**constants)[0] if constants else coefficients()[0]
+    partials = sensitivities(codes, follow_ups, slopes)
+    columns = {}
+    for q, question_id in enumerate(QUESTION_IDS):
+        for m, metric in enumerate(METRICS):
+            columns[f"{metric}_per_{question_id}"] = partials[:, q, m]
+    return pd.DataFrame(columns, index=frame.index)
@@ -0,0 +1,186 @@
+# Concurrent-session load test for both apps.
+# Drives maturity.py and executive.py through complete assessments with
+# Streamlit's testing API (AppTest) and random answers, many sessions at once,
+# to see how many concurrent respondents one server can sustain. Everything
+# runs in-process against the app scripts; no server or network is needed.
+#
+#   python loadtest.py --sessions 200 --concurrency 16
+#   python loadtest.py --app executive --processes 4 --sessions 400
+#
+# Reports per-rerun latency (p50/p95/p99), reruns per second and the resident
+# memory added per live session. Completed assessments go to a throwaway
+# database unless --db is given.
+#
+# AppTest swaps process-wide Streamlit state (the runtime, config options) on
+# every run, so it cannot run scripts on several threads at once. Instead each
+# process keeps --concurrency sessions open and steps them round-robin, one
+# rerun at a time, which is what a single-core server does with interleaved
+# requests; --processes runs that many of these side by side for parallelism.
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+import bench
+import diagnostic
+import scoring
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APPS = ('maturity', 'executive')
+TIMEOUT = 60
+
+
+def _rss_bytes():
+    # Current resident set size (Linux)
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+class Session:
+    # One simulated respondent; every script run is timed
+
+    def __init__(self, app):
+        from streamlit.testing.v1 import AppTest
+        self.app = AppTest.from_file(os.path.join(HERE, f'{app}.py'), default_timeout=TIMEOUT)
+        self.latencies = []
+
+    def run(self, widget=None):
+        started = time.perf_counter()
+        (widget or self.app).run()
+        self.latencies.append(time.perf_counter() - started)
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].message)
+
+
+# Each step generator performs one rerun per step, so sessions can be interleaved
+
+def maturity_steps(session, rng):
+    session.run()
+    yield
+    for question_id, answer in bench.synthetic_answers(rng).items():
+        question = next(q for q in scoring.questions if q['id'] == question_id)
+        position = [option['value'] for option in question['options']].index(answer['value'])
+        session.run(session.app.button(key=f"opt_{question_id}_{position}").click())
+        yield
+        session.run(session.app.text_input(key=f"followup_{question_id}").input(answer['follow_up']))
+        yield
+        session.run(next(b for b in session.app.button if b.label.startswith(('Next', 'Generate'))).click())
+        yield
+
+
+def executive_steps(session, rng):
+    session.run()
+    yield
+    answers = bench.synthetic_diagnostic(rng)
+    questions = diagnostic.pain_questions + [diagnostic.revenue_question]
+    for selectbox, question in zip(session.app.selectbox, questions):
+        selectbox.select(answers[question['id']])
+    session.run(session.app.button[0].click())
+    yield
+
+
+_steps = {
+    'maturity': maturity_steps,
+    'executive': executive_steps,
+}
+
+
+def run_sessions(apps, sessions, concurrency, seed):
+    # Runs `sessions` assessments (alternating over apps), keeping up to
+    # `concurrency` of them in progress at once. Finished sessions stay
+    # referenced until the end, the way a server keeps them until they expire,
+    # so the memory they hold shows up in the RSS growth.
+    for app in apps:
+        # Warm-up: imports and process-wide caches are not per-session costs
+        for _ in _steps[app](Session(app), random.Random(seed)):
+            pass
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+    pending = [(apps[i % len(apps)], random.Random(seed + i + 1)) for i in range(sessions)]
+    pending.reverse()
+    active = []
+    completed = []
+    while pending or active:
+        while pending and len(active) < concurrency:
+            app, rng = pending.pop()
+            session = Session(app)
+            active.append((app, session, _steps[app](session, rng)))
+        for entry in list(active):
+            if next(entry[2], StopIteration) is StopIteration:
+                active.remove(entry)
+                completed.append(entry[:2])
+    elapsed = time.perf_counter() - started
+    rss_growth = _rss_bytes() - rss_before
+    latencies = {app: [] for app in apps}
+    for app, session in completed:
+        latencies[app].extend(session.latencies)
+    return {'latencies': latencies, 'elapsed': elapsed, 'sessions': sessions, 'rss_growth': rss_growth}
+
+
+def _worker(args):
+    return run_sessions(*args)
+
+
+def percentile(ordered, share):
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, min(len(ordered) - 1, round(share / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def merge(results):
+    merged = {'latencies': {}, 'elapsed': 0.0, 'sessions': 0, 'rss_growth': 0}
+    for result in results:
+        for app, latencies in result['latencies'].items():
+            merged['latencies'].setdefault(app, []).extend(latencies)
+        # Workers run side by side, so the slowest one is the wall time
+        merged['elapsed'] = max(merged['elapsed'], result['elapsed'])
+        merged['sessions'] += result['sessions']
+        merged['rss_growth'] += result['rss_growth']
+    return merged
+
+
+def report(result):
+    print(f"{'app':<12} {'reruns':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    total_reruns = 0
+    for app, latencies in result['latencies'].items():
+        ordered = sorted(latencies)
+        total_reruns += len(ordered)
+        print(f"{app:<12} {len(ordered):>8} " + " ".join(
+            f"{percentile(ordered, share) * 1000:>7.1f}ms" for share in (50, 95, 99))
+            + f" {ordered[-1] * 1000:>7.1f}ms")
+    print(f"{result['sessions']} sessions, {total_reruns} reruns in {result['elapsed']:.1f}s: "
+          f"{total_reruns / result['elapsed']:.1f} reruns/s, "
+          f"{result['sessions'] / result['elapsed']:.2f} assessments/s")
+    print(f"memory growth: {result['rss_growth'] / result['sessions'] / 1024:.0f} KiB per session")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test both apps with simulated sessions.")
+    parser.add_argument('--app', choices=APPS + ('both',), default='both')
+    parser.add_argument('--sessions', type=int, default=100, help="complete assessments to run")
+    parser.add_argument('--concurrency', type=int, default=8, help="sessions in progress at once, per process")
+    parser.add_argument('--processes', type=int, default=1, help="worker processes")
+    parser.add_argument('--seed', type=int, default=bench.SEED)
+    parser.add_argument('--db', help="assessment database (default: a temporary file)")
+    args = parser.parse_args(argv)
+
+    apps = APPS if args.app == 'both' else (args.app,)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['ASSESSMENT_DB'] = args.db or os.path.join(tmp, 'loadtest.db')
+        if args.processes == 1:
+            result = run_sessions(apps, args.sessions, args.concurrency, args.seed)
+        else:
+            # Sessions split evenly; each worker gets its own seed range
+            shares = [args.sessions // args.processes + (i < args.sessions % args.processes)
+                      for i in range(args.processes)]
+            work = [(apps, share, args.concurrency, args.seed + i * args.sessions)
+                    for i, share in enumerate(shares) if share]
+            with multiprocessing.get_context('fork').Pool(len(work)) as pool:
+                result = merge(pool.map(_worker, work))
+    report(result)
+
+
+if __name__ == "__main__":
+    main()
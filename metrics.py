@@ -0,0 +1,173 @@
+# In-process metrics for the hot paths of both apps.
+# instrument() wraps a function and records, per name, the call count, total
+# and maximum wall time, a latency histogram and the change in the number of
+# allocated memory blocks across each call. The registry is exported in the
+# Prometheus text format:
+#
+#   METRICS_PORT=9100    serve it at http://localhost:9100/metrics
+#   METRICS_FILE=/path   rewrite the file every METRICS_INTERVAL seconds
+#                        (default 15), e.g. for node_exporter's textfile collector
+#
+# Recording is always on and costs about a microsecond per call. The block
+# counts are process-wide, so with many sessions running at once they include
+# other threads' allocations and are only meaningful as averages.
+import functools
+import os
+import sys
+import threading
+import time
+
+PREFIX = 'assessment'
+# Upper bounds in seconds of the latency histogram buckets
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, blocks):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = {
+                    'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'blocks': 0,
+                    'buckets': [0] * len(BUCKETS),
+                }
+            metric['calls'] += 1
+            metric['seconds'] += seconds
+            metric['blocks'] += blocks
+            if seconds > metric['max_seconds']:
+                metric['max_seconds'] = seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    metric['buckets'][i] += 1
+                    break
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(metric, buckets=list(metric['buckets'])) for name, metric in self._metrics.items()}
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def prometheus_text(self):
+        metrics = sorted(self.snapshot().items())
+        lines = []
+
+        def family(suffix, kind, description, samples):
+            lines.append(f"# HELP {PREFIX}_{suffix} {description}")
+            lines.append(f"# TYPE {PREFIX}_{suffix} {kind}")
+            lines.extend(samples)
+
+        family('calls_total', 'counter', "Calls of an instrumented function.",
+               [f'{PREFIX}_calls_total{{function="{name}"}} {m["calls"]}' for name, m in metrics])
+        family('max_seconds', 'gauge', "Slowest call of an instrumented function.",
+               [f'{PREFIX}_max_seconds{{function="{name}"}} {m["max_seconds"]:.6f}' for name, m in metrics])
+        family('allocated_blocks_total', 'counter',
+               "Net change in allocated memory blocks across calls (negative when calls free memory).",
+               [f'{PREFIX}_allocated_blocks_total{{function="{name}"}} {m["blocks"]}' for name, m in metrics])
+        samples = []
+        for name, m in metrics:
+            cumulative = 0
+            for bound, count in zip(BUCKETS, m['buckets']):
+                cumulative += count
+                samples.append(f'{PREFIX}_duration_seconds_bucket{{function="{name}",le="{bound}"}} {cumulative}')
+            samples.append(f'{PREFIX}_duration_seconds_bucket{{function="{name}",le="+Inf"}} {m["calls"]}')
+            samples.append(f'{PREFIX}_duration_seconds_sum{{function="{name}"}} {m["seconds"]:.6f}')
+            samples.append(f'{PREFIX}_duration_seconds_count{{function="{name}"}} {m["calls"]}')
+        family('duration_seconds', 'histogram', "Wall time of an instrumented function.", samples)
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every session in the process
+registry = Registry()
+
+
+def instrument(name):
+    # Decorator recording each call under `name` (e.g. 'scoring.calculate_findings'),
+    # including calls that raise
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            blocks = sys.getallocatedblocks()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.record(name, time.perf_counter() - started, sys.getallocatedblocks() - blocks)
+        return wrapper
+    return decorate
+
+
+def _serve(port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('', port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+
+
+def write_file(path):
+    # Written to a temporary file and renamed so readers never see a partial dump
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        handle.write(registry.prometheus_text())
+    os.replace(temporary, path)
+
+
+def _dump_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_file(path)
+        except OSError:
+            # Keep dumping; the directory may come back (e.g. a remounted volume)
+            pass
+
+
+_exporting = False
+_export_lock = threading.Lock()
+
+
+def start_exporter():
+    # Starts the configured exporters once per process; the apps call this on
+    # every run, so later calls return immediately
+    global _exporting
+    if _exporting:
+        return
+    with _export_lock:
+        if _exporting:
+            return
+        _exporting = True
+        port = os.environ.get('METRICS_PORT')
+        if port:
+            try:
+                _serve(int(port))
+            except OSError as error:
+                # Port already taken, e.g. by a second app on the same host
+                print(f"metrics: cannot serve on port {port}: {error}", file=sys.stderr)
+        path = os.environ.get('METRICS_FILE')
+        if path:
+            interval = float(os.environ.get('METRICS_INTERVAL', 15))
+            threading.Thread(target=_dump_periodically, args=(path, interval),
+                             name='metrics-file', daemon=True).start()
@@ -0,0 +1,154 @@
+# Background PDF export of maturity reports.
+# Rendering a PDF takes long enough that doing it in the Streamlit script thread
+# would stall the session, so jobs run in a small bounded thread pool and the
+# page polls for completion. Finished PDFs are kept in an LRU keyed by the
+# scoring config version, answers fingerprint and date, so repeat downloads
+# (from any session) are free.
+#
+# fpdf2 is imported by the worker on first use; without it the job fails and
+# the page reports that PDF export is unavailable.
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from report_cache import answers_fingerprint
+from scoring_config import get_config
+
+PENDING, DONE, FAILED = 'pending', 'done', 'failed'
+
+
+def _latin1(text):
+    # The built-in PDF fonts only cover Latin-1; anything else becomes '?'
+    return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+
+def render_pdf(report, report_date):
+    from fpdf import FPDF
+
+    findings = report['findings']
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    width = pdf.epw
+
+    def line(text, size=11, style='', color=(31, 41, 55), height=6):
+        pdf.set_font('Helvetica', style, size)
+        pdf.set_text_color(*color)
+        pdf.multi_cell(width, height, _latin1(text))
+
+    line("Business Data Health Report", size=20, style='B', height=10)
+    line(f"Confidential Assessment - {report_date:%B %d, %Y}", size=10, color=(107, 114, 128))
+    pdf.ln(6)
+
+    line("Total Annual Impact Identified", size=14, style='B', color=(153, 27, 27))
+    line(f"${report['total_impact']:,.0f}", size=24, style='B', color=(220, 38, 38), height=12)
+    line("Estimated annual cost and risk exposure from data challenges", size=10, color=(107, 114, 128))
+    pdf.ln(4)
+    line(f"Annual Costs: ${findings['total_annual_cost']:,.0f}")
+    line(f"Risk Exposure: ${findings['risk_exposure']:,.0f}")
+    line(f"Hours Wasted: {int(findings['time_wasted']):,} hrs/year")
+
+    sections = [
+        ("Critical Issues Identified", findings['critical_issues'], 'impact', 'detail', (220, 38, 38)),
+        ("Revenue & Cost Reduction Opportunities", findings['opportunities'], 'potential', 'improvement', (5, 150, 105)),
+    ]
+    for title, items, headline, detail, color in sections:
+        if not items:
+            continue
+        pdf.ln(6)
+        line(title, size=14, style='B')
+        for item in items:
+            pdf.ln(2)
+            line(item['area'], style='B')
+            line(item[headline], color=color)
+            line(item[detail], size=10, color=(107, 114, 128))
+
+    pdf.ln(6)
+    line("Bottom Line", size=14, style='B', color=(30, 64, 175))
+    line(f"Based on your responses, your organization is facing ${report['total_impact']:,.0f} in annual "
+         "costs and risk exposure due to data challenges. The good news: most of this is preventable with "
+         "the right data infrastructure and processes.")
+    line(f"Estimated First-Year ROI with Data Solutions: {report['roi_percent']}% ROI", style='B',
+         color=(59, 130, 246))
+    line("Typical 6-8 month payback period", size=10, color=(107, 114, 128))
+
+    pdf.ln(6)
+    line("Schedule a 30-Minute Strategy Call", size=14, style='B')
+    line("No obligation. We'll discuss your specific situation and potential solutions.")
+    line("Email: jayron.soares@gayaanalytics.com.br")
+    line("Phone: +55(21) 98983-8805")
+    return bytes(pdf.output())
+
+
+class PdfExporter:
+    # At most max_workers PDFs render at once; further jobs wait in the pool's
+    # queue. Finished PDFs and errors are moved out of the running jobs as soon
+    # as a job ends, and each is kept until max_cached newer ones push it out.
+
+    def __init__(self, max_workers=2, max_cached=256):
+        self.max_cached = max_cached
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pdf-export')
+        self._jobs = {}
+        self._done = OrderedDict()
+        self._errors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def job_key(self, answers, report_date=None):
+        return f"{get_config().version}:{answers_fingerprint(answers)}:{(report_date or date.today()).isoformat()}"
+
+    def submit(self, key, report, report_date=None):
+        # Starts a job unless the PDF is already cached or being rendered;
+        # a failed job is retried
+        with self._lock:
+            if key in self._done or key in self._jobs:
+                return key
+            self._errors.pop(key, None)
+            job = self._jobs[key] = self._pool.submit(render_pdf, report, report_date or date.today())
+        # Outside the lock: the callback runs right here if the job already finished
+        job.add_done_callback(functools.partial(self._finish, key))
+        return key
+
+    def _finish(self, key, job):
+        # Runs when a job ends, whether or not any page is still polling it
+        with self._lock:
+            self._jobs.pop(key, None)
+            if job.cancelled():
+                return
+            error = job.exception()
+            if error is None:
+                finished = self._done
+                finished[key] = job.result()
+            else:
+                finished = self._errors
+                finished[key] = error
+            while len(finished) > self.max_cached:
+                finished.popitem(last=False)
+
+    def status(self, key):
+        # None for a job that was never submitted or whose result was evicted
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                return DONE
+            if key in self._errors:
+                return FAILED
+            if key in self._jobs:
+                return PENDING
+            return None
+
+    def error(self, key):
+        with self._lock:
+            return self._errors.get(key)
+
+    def result(self, key):
+        # PDF bytes once finished, otherwise None
+        if self.status(key) == DONE:
+            with self._lock:
+                return self._done.get(key)
+        return None
+
+
+# Shared by every session in the process
+pdf_exporter = PdfExporter()
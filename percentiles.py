@@ -0,0 +1,125 @@
+# Peer percentile ranking over stored assessments.
+# For each (app, peer group, metric) the index keeps a sorted NumPy array of
+# the stored values, so ranking one respondent is a binary search. Peer groups
+# are the executive revenue bands plus "all"; the maturity assessment has no
+# revenue question and only uses "all".
+#
+# The index is a snapshot, built in a background thread on first use and
+# rebuilt there once it is older than refresh_interval; the page never waits
+# on the scan, and no ranks are shown until the first snapshot is ready.
+# Groups larger than max_samples keep max_samples evenly spaced order
+# statistics instead of every value, so memory stays bounded at millions of
+# assessments and the error is at most 1 / max_samples.
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+import assessment_store
+
+ALL = 'all'
+# app -> (answers field holding the peer group or None, ranked result metrics)
+PEER_METRICS = {
+    'maturity': (None, ('total_annual_cost', 'risk_exposure', 'time_wasted')),
+    'executive': ('revenue_size', ('opportunity_cost', 'pain_score')),
+}
+MIN_PEERS = 20
+
+
+def _downsample(values, max_samples):
+    values.sort()
+    if len(values) > max_samples:
+        values = values[np.linspace(0, len(values) - 1, max_samples).round().astype(np.intp)]
+    return values
+
+
+def build_index(path, max_samples=10_000, fetch_size=100_000):
+    # {(app, group, metric): sorted float array}
+    try:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.OperationalError:
+        return {}
+    chunks = {}
+    try:
+        for app, (group_field, metrics) in PEER_METRICS.items():
+            group = f"json_extract(answers, '$.{group_field}')" if group_field else f"'{ALL}'"
+            columns = ', '.join(f"json_extract(results, '$.{metric}')" for metric in metrics)
+            cursor = connection.execute(f"SELECT {group}, {columns} FROM assessments WHERE app = ?", (app,))
+            while rows := cursor.fetchmany(fetch_size):
+                groups = np.array([row[0] for row in rows], dtype=object)
+                values = np.array([row[1:] for row in rows], dtype=float)
+                for name in ({ALL} | set(groups)) - {None}:
+                    selected = values if name == ALL else values[groups == name]
+                    for m, metric in enumerate(metrics):
+                        chunks.setdefault((app, name, metric), []).append(selected[:, m])
+    except sqlite3.OperationalError:
+        # No assessments table yet
+        return {}
+    finally:
+        connection.close()
+
+    index = {}
+    for key, parts in chunks.items():
+        values = np.concatenate(parts)
+        values = values[~np.isnan(values)]
+        if len(values):
+            index[key] = _downsample(values, max_samples)
+    return index
+
+
+class PeerIndex:
+
+    def __init__(self, path, refresh_interval=600, max_samples=10_000):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.max_samples = max_samples
+        self.built_at = None
+        self._index = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _build(self):
+        index = build_index(self.path, self.max_samples)
+        self._index = index
+        self.built_at = time.monotonic()
+
+    def _refresh(self):
+        try:
+            self._build()
+        finally:
+            self._refreshing = False
+
+    def index(self):
+        # Current snapshot, or None while the first one is being built
+        stale = self._index is None or time.monotonic() - self.built_at > self.refresh_interval
+        if stale and not self._refreshing:
+            # Serve the current snapshot (if any) while a new one is built
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, name='peer-index-refresh', daemon=True).start()
+        return self._index
+
+    def percentile(self, app, metric, value, group=ALL):
+        # Share of peers (0-100) with a strictly lower value; None with too few
+        # peers or before the first snapshot is ready
+        index = self.index()
+        if index is None:
+            return None
+        values = index.get((app, group, metric))
+        if values is None or len(values) < MIN_PEERS:
+            return None
+        return 100.0 * np.searchsorted(values, value, side='left') / len(values)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_peer_index(path=None):
+    path = path or assessment_store.database_path()
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = PeerIndex(path)
+        return _indexes[path]
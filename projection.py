@@ -0,0 +1,101 @@
+# Multi-year ROI projections for the executive calculator, for one lead or a
+# whole batch at once (e.g. every stored lead).
+# Per scenario, for years 1..years:
+#   benefit   the annual opportunity, growing by `growth` of the first year's
+#             value each year (1.0, 1.1, 1.2, ... by default)
+#   cost      the investment in year 1, then `support_rate` of it each year
+# For NPV and IRR the investment is paid up front (t = 0) and every other
+# flow at the end of its year.
+#
+# Inputs broadcast to shape (N,); outputs are arrays of shape (N,) or
+# (N, years). IRR uses Newton's method on all scenarios at once.
+import numpy as np
+
+YEARS = 3
+GROWTH = 0.1
+SUPPORT_RATE = 0.25
+DISCOUNT_RATE = 0.1
+IRR_TOLERANCE = 1e-10
+IRR_MAX_ITERATIONS = 100
+
+
+def project(opportunity, investment, years=YEARS, growth=GROWTH, support_rate=SUPPORT_RATE,
+            discount_rate=DISCOUNT_RATE):
+    # {'benefits', 'costs', 'net', 'cumulative'}: (N, years) per-year values;
+    # {'flows'}: (N, years + 1) timed cash flows; {'npv', 'irr'}: (N,)
+    opportunity, investment = np.broadcast_arrays(np.atleast_1d(np.asarray(opportunity, dtype=float)),
+                                                  np.atleast_1d(np.asarray(investment, dtype=float)))
+    benefits = opportunity[:, None] * (1 + growth * np.arange(years))
+    costs = np.repeat((investment * support_rate)[:, None], years, axis=1)
+    costs[:, 0] = investment
+    net = benefits - costs
+    flows = np.empty((len(opportunity), years + 1))
+    flows[:, 0] = -investment
+    flows[:, 1:] = benefits
+    flows[:, 2:] -= costs[:, 1:]
+    return {
+        'benefits': benefits,
+        'costs': costs,
+        'net': net,
+        'cumulative': np.cumsum(net, axis=1),
+        'flows': flows,
+        'npv': npv(flows, discount_rate),
+        'irr': irr(flows),
+    }
+
+
+def npv(flows, rate):
+    # Net present value of (N, T + 1) flows at t = 0..T; rate is a scalar or (N,)
+    flows = np.atleast_2d(flows)
+    periods = np.arange(flows.shape[1])
+    discount = (1 + np.asarray(rate, dtype=float).reshape(-1, 1)) ** -periods
+    return (flows * discount).sum(axis=1)
+
+
+def irr(flows, guess=None):
+    # Rate where npv(flows, rate) = 0, by Newton iteration over all rows at
+    # once. NaN where there is no rate (flows that never change sign, or no
+    # root) or the iteration does not converge.
+    #
+    # With x = 1 / (1 + rate) the npv is a polynomial in x, which Newton's
+    # method solves in a handful of steps even for IRRs in the thousands of
+    # percent, where iterating on the rate itself crawls.
+    flows = np.atleast_2d(np.asarray(flows, dtype=float))
+    inflow = np.where(flows > 0, flows, 0).sum(axis=1)
+    outflow = np.where(flows < 0, -flows, 0).sum(axis=1)
+    valid = (inflow > 0) & (outflow > 0)
+    solution = np.full(len(flows), np.nan)
+    # Rows still iterating, shrunk as they converge so late iterations only
+    # touch the few slow or rootless rows
+    rows = np.flatnonzero(valid)
+    if guess is None:
+        # Discount factor that turns the total inflow into the total outflow over the horizon
+        current = (outflow[rows] / inflow[rows]) ** (1 / max(flows.shape[1] - 1, 1))
+    else:
+        current = 1 / (1 + np.broadcast_to(np.asarray(guess, dtype=float), valid.shape)[rows])
+    columns = flows[rows]
+    for _ in range(IRR_MAX_ITERATIONS):
+        if not len(rows):
+            break
+        # Horner's rule: the polynomial and its derivative in one pass over the periods
+        value = columns[:, -1].copy()
+        derivative = np.zeros_like(value)
+        for t in range(columns.shape[1] - 2, -1, -1):
+            derivative = derivative * current + value
+            value = value * current + columns[:, t]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = value / derivative
+        updated = current - step
+        # x must stay positive (rates above -100%)
+        updated = np.where(updated <= 0, current / 2, updated)
+        finite = np.isfinite(updated)
+        done = finite & (np.abs(step) <= IRR_TOLERANCE * updated)
+        solution[rows[done]] = updated[done]
+        keep = finite & ~done
+        if not keep.all():
+            rows, current, columns = rows[keep], updated[keep], columns[keep]
+        else:
+            current = updated
+    # Rows left are still moving after the last iteration: no converged rate
+    with np.errstate(divide='ignore'):
+        return 1 / solution - 1
@@ -0,0 +1,44 @@
+# HTML fragments for the maturity report (maturity.show_report).
+# Streamlit-free so the fragments can be cached and reused across sessions.
+# The markup lives in templates.py.
+import templates
+from metrics import instrument
+
+
+def render_total_impact(total_impact):
+    return templates.TOTAL_IMPACT.render(total_impact=total_impact)
+
+
+def render_issue_card(issue):
+    return templates.ISSUE_CARD.render(area=issue['area'], impact=issue['impact'], detail=issue['detail'])
+
+
+def render_opportunity_card(opp):
+    return templates.OPPORTUNITY_CARD.render(area=opp['area'], potential=opp['potential'],
+                                             improvement=opp['improvement'])
+
+
+def render_bottom_line(total_impact, roi_percent):
+    return templates.BOTTOM_LINE.render(total_impact=total_impact, roi_percent=roi_percent)
+
+
+def render_call_to_action(findings):
+    return templates.CALL_TO_ACTION.render(recoverable_cost=int(findings['total_annual_cost'] * 0.7),
+                                           risk_exposure=findings['risk_exposure'])
+
+
+@instrument('report.build_report')
+def build_report(findings):
+    # Everything show_report displays, derived from the findings alone
+    total_impact = findings['total_annual_cost'] + findings['risk_exposure']
+    roi_percent = int((total_impact * 0.6) / (total_impact * 0.15) * 100) if total_impact > 0 else 0
+    return {
+        'findings': findings,
+        'total_impact': total_impact,
+        'roi_percent': roi_percent,
+        'total_impact_html': render_total_impact(total_impact),
+        'issue_cards': [render_issue_card(issue) for issue in findings['critical_issues']],
+        'opportunity_cards': [render_opportunity_card(opp) for opp in findings['opportunities']],
+        'bottom_line_html': render_bottom_line(total_impact, roi_percent),
+        'call_to_action_html': render_call_to_action(findings),
+    }
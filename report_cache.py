@@ -0,0 +1,107 @@
+# Cross-session cache of maturity reports keyed by an answers fingerprint.
+# Many respondents pick the same options with round follow-up numbers, so the
+# findings and pre-rendered HTML fragments are computed once per distinct answer
+# set and then shared by every session in the process.
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import report
+import scoring
+from scoring_config import get_config
+
+
+def _canonical_follow_up(question_id, follow_up):
+    # "4", "4.0" and 4 render identically, so they share a cache entry
+    question = scoring.registry.get(question_id)
+    if follow_up and question is not None and question.follow_up_type == 'number':
+        try:
+            return float(follow_up)
+        except (TypeError, ValueError):
+            pass
+    return follow_up
+
+
+def _canonical_answer(question_id, answer):
+    # A follow-up that was never given stays absent: the findings render an
+    # absent compliance follow-up differently from an explicit None
+    if 'follow_up' not in answer:
+        return [answer.get('value')]
+    return [answer.get('value'), _canonical_follow_up(question_id, answer['follow_up'])]
+
+
+def answers_fingerprint(answers):
+    if isinstance(answers, scoring.AnswerRecord):
+        answers = answers.to_dict()
+    canonical = {question_id: _canonical_answer(question_id, answer) for question_id, answer in answers.items()}
+    payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    # Thread-safe LRU with an optional time-to-live; Streamlit serves sessions
+    # from multiple threads, so all bookkeeping happens under one lock.
+
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_report(self, answers):
+        # Reports built under an earlier scoring config are never served
+        key = f"{get_config().version}:{answers_fingerprint(answers)}"
+        cached = self.get(key)
+        if cached is None:
+            # Built outside the lock; a concurrent miss on the same key just
+            # builds the same report twice
+            cached = report.build_report(scoring.calculate_findings(answers))
+            self.put(key, cached)
+        return cached
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every session in the process; cached reports must be treated as read-only
+report_cache = ReportCache()
@@ -0,0 +1,113 @@
+# Offline scoring of survey response exports (CSV or Parquet).
+# Streams the input in fixed-size chunks, scores each chunk with the maturity
+# findings (batch.score_frame), the executive diagnostic (batch.diagnose_frame)
+# and the detailed ROI (batch.detailed_frame), and appends the enriched rows to a Parquet file, so memory stays bounded by the
+# chunk size regardless of the export size.
+#
+# Maturity columns:   <question_id> and <question_id>_follow_up (see batch.py)
+# Executive columns:  <prefix><question_id> holding the answer labels, where the
+#                     prefix defaults to "exec_" (e.g. exec_revenue_size)
+# Detailed ROI:       <prefix><question_id> for detailed_roi.QUESTION_IDS, where the
+#                     prefix defaults to "roi_"; results are prefixed "detailed_"
+#
+# Usage: python score_exports.py responses.csv scored.parquet --chunk-size 100000 --workers 4
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import batch
+import detailed_roi
+import diagnostic
+
+
+def read_chunks(path, chunk_size):
+    if path.endswith('.parquet'):
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield record_batch.to_pandas()
+    else:
+        # Keep every column as text so follow-ups are parsed exactly like the app's strings
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False, na_values=[''])
+
+
+def score_chunk(chunk, executive_prefix='exec_', detailed_prefix='roi_'):
+    enriched = [chunk]
+    if any(question_id in chunk for question_id in batch.QUESTION_IDS):
+        enriched.append(batch.score_frame(chunk))
+    if all(executive_prefix + question_id in chunk for question_id in diagnostic.QUESTION_IDS):
+        enriched.append(batch.diagnose_frame(chunk, prefix=executive_prefix))
+    if all(detailed_prefix + question_id in chunk for question_id in detailed_roi.QUESTION_IDS):
+        # Prefixed so they do not collide with the diagnostic's roi and investment
+        enriched.append(batch.detailed_frame(chunk, prefix=detailed_prefix).add_prefix('detailed_'))
+    return pd.concat(enriched, axis=1)
+
+
+def _scored_chunks(chunks, workers, executive_prefix, detailed_prefix):
+    # Yields scored chunks in input order. With a process pool, at most
+    # 2 x workers chunks are in flight so memory stays bounded.
+    if workers <= 1:
+        for chunk in chunks:
+            yield score_chunk(chunk, executive_prefix, detailed_prefix)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(score_chunk, chunk, executive_prefix, detailed_prefix))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_file(input_path, output_path, chunk_size=100_000, workers=1, executive_prefix='exec_',
+               detailed_prefix='roi_', log=sys.stderr):
+    writer = None
+    total_rows = 0
+    started = last = time.perf_counter()
+    try:
+        chunks = read_chunks(input_path, chunk_size)
+        for number, scored in enumerate(_scored_chunks(chunks, workers, executive_prefix, detailed_prefix), start=1):
+            table = pa.Table.from_pandas(scored, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+
+            now = time.perf_counter()
+            total_rows += len(scored)
+            elapsed = now - last
+            last = now
+            print(f"chunk {number}: {len(scored):,} rows in {elapsed:.2f}s "
+                  f"({len(scored) / elapsed:,.0f} rows/s)", file=log)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - started
+    rate = total_rows / elapsed if elapsed else 0
+    print(f"scored {total_rows:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s) -> {output_path}", file=log)
+    return total_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score exported assessment responses into a Parquet file.")
+    parser.add_argument('input', help="CSV or Parquet export, one row per respondent")
+    parser.add_argument('output', help="Parquet file to write")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="rows per chunk (default: 100000)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f"processes to score chunks with (default: 1, this machine has {os.cpu_count()})")
+    parser.add_argument('--executive-prefix', default='exec_',
+                        help="column prefix for executive diagnostic answers (default: exec_)")
+    parser.add_argument('--detailed-prefix', default='roi_',
+                        help="column prefix for detailed ROI answers (default: roi_)")
+    args = parser.parse_args(argv)
+    score_file(args.input, args.output, args.chunk_size, args.workers, args.executive_prefix, args.detailed_prefix)
+
+
+if __name__ == "__main__":
+    main()
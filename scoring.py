@@ -0,0 +1,435 @@
+# Streamlit-free scoring for the maturity assessment. Kept separate from
+# maturity.py so batch jobs and APIs can score answers without the Streamlit runtime.
+import math
+from array import array
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from metrics import instrument
+from scoring_config import get_config
+
+# The economic assumptions (hourly cost, opportunity value, compliance
+# exposure, ...) live in scoring_config.json; see scoring_config.py
+
+# Questions data structure
+questions = [
+    {
+        'id': 'reporting_time',
+        'category': 'time',
+        'question': 'How long does it take your team to produce key business reports?',
+        'subtitle': 'Weekly sales, month-end close, performance dashboards - from request to delivery',
+        'options': [
+            {'value': 'minutes', 'label': 'Minutes to 1 hour', 'risk': 'low'},
+            {'value': 'hours', 'label': '2-8 hours', 'risk': 'low'},
+            {'value': 'day', 'label': '1-2 days', 'risk': 'medium', 'cost': 16},
+            {'value': 'days', 'label': '3-5 days', 'risk': 'high', 'cost': 40},
+            {'value': 'week', 'label': 'More than a week', 'risk': 'critical', 'cost': 80}
+        ],
+        'follow_up': 'How many people are involved in creating these reports?',
+        'follow_up_type': 'number',
+        'follow_up_label': 'Number of people',
+        'follow_up_help': 'Enter the number of team members'
+    },
+    {
+        'id': 'manual_work',
+        'category': 'cost',
+        'question': 'How much time does your team spend on manual data work each week?',
+        'subtitle': 'Copying data between systems, fixing errors, reconciling spreadsheets, manual entry',
+        'options': [
+            {'value': 'none', 'label': 'Almost none (< 2 hours/week)', 'risk': 'low'},
+            {'value': 'some', 'label': '5-10 hours/week', 'risk': 'medium', 'hours': 7.5},
+            {'value': 'significant', 'label': '15-25 hours/week', 'risk': 'high', 'hours': 20},
+            {'value': 'substantial', 'label': '30-40 hours/week', 'risk': 'high', 'hours': 35},
+            {'value': 'extreme', 'label': 'More than 40 hours/week', 'risk': 'critical', 'hours': 50}
+        ],
+        'follow_up': 'What is the average hourly cost of these team members?',
+        'follow_up_type': 'number',
+        'follow_up_label': 'Hourly rate (USD)',
+        'follow_up_help': 'Enter dollar amount without symbols (e.g., 75)'
+    },
+    {
+        'id': 'data_accuracy',
+        'category': 'risk',
+        'question': 'How often do you discover errors in reports or make decisions based on incorrect data?',
+        'subtitle': 'Wrong numbers, outdated data, different reports showing different numbers',
+        'options': [
+            {'value': 'rarely', 'label': 'Rarely or never', 'risk': 'low'},
+            {'value': 'monthly', 'label': 'A few times per month', 'risk': 'medium', 'frequency': 3},
+            {'value': 'weekly', 'label': 'Weekly', 'risk': 'high', 'frequency': 4},
+            {'value': 'daily', 'label': 'Multiple times per week', 'risk': 'high', 'frequency': 12},
+            {'value': 'constant', 'label': 'Almost daily', 'risk': 'critical', 'frequency': 20}
+        ],
+        'follow_up': 'Approximately how much does a bad-data decision cost?',
+        'follow_up_type': 'number',
+        'follow_up_label': 'Cost per incident (USD)',
+        'follow_up_help': 'Rough estimate in dollars (e.g., 1000)'
+    },
+    {
+        'id': 'decision_speed',
+        'category': 'revenue',
+        'question': 'When you need to answer an urgent business question, how quickly can you get reliable data?',
+        'subtitle': 'Example: "Which customers haven\'t ordered in 60 days?" or "What\'s inventory for product X?"',
+        'options': [
+            {'value': 'instant', 'label': 'Within minutes', 'risk': 'low'},
+            {'value': 'same_day', 'label': 'Same day (few hours)', 'risk': 'low'},
+            {'value': 'next_day', 'label': '1-2 days', 'risk': 'medium', 'delay': 1.5},
+            {'value': 'several_days', 'label': '3-5 days', 'risk': 'high', 'delay': 4},
+            {'value': 'week_plus', 'label': 'A week or more', 'risk': 'critical', 'delay': 7}
+        ],
+        'follow_up': 'How many time-sensitive opportunities or issues come up per month?',
+        'follow_up_type': 'number',
+        'follow_up_label': 'Opportunities per month',
+        'follow_up_help': 'Approximate number (e.g., 10)'
+    },
+    {
+        'id': 'data_silos',
+        'category': 'cost',
+        'question': 'How many different systems contain critical business data that don\'t talk to each other?',
+        'subtitle': 'CRM, ERP, accounting software, Excel files, departmental databases',
+        'options': [
+            {'value': '1-2', 'label': '1-2 systems (well integrated)', 'risk': 'low'},
+            {'value': '3-5', 'label': '3-5 systems', 'risk': 'medium', 'systems': 4},
+            {'value': '6-10', 'label': '6-10 systems', 'risk': 'high', 'systems': 8},
+            {'value': '11-15', 'label': '11-15 systems', 'risk': 'high', 'systems': 13},
+            {'value': '15+', 'label': 'More than 15 systems', 'risk': 'critical', 'systems': 20}
+        ],
+        'follow_up': 'How many hours per week are spent combining data from these sources?',
+        'follow_up_type': 'number',
+        'follow_up_label': 'Hours per week',
+        'follow_up_help': 'Estimated hours (e.g., 15)'
+    },
+    {
+        'id': 'compliance_audit',
+        'category': 'risk',
+        'question': 'How confident are you in your ability to pass an audit or prove compliance?',
+        'subtitle': 'Can you show where data came from, who changed it, and prove accuracy?',
+        'options': [
+            {'value': 'very_confident', 'label': 'Very confident - full audit trail', 'risk': 'low'},
+            {'value': 'mostly_confident', 'label': 'Mostly confident', 'risk': 'low'},
+            {'value': 'somewhat_confident', 'label': 'Somewhat confident', 'risk': 'medium'},
+            {'value': 'not_confident', 'label': 'Not very confident', 'risk': 'high'},
+            {'value': 'worried', 'label': 'Seriously concerned', 'risk': 'critical'}
+        ],
+        'follow_up': 'Are you subject to specific compliance requirements?',
+        'follow_up_type': 'text',
+        'follow_up_label': 'Compliance requirements',
+        'follow_up_help': 'e.g., SOX, GDPR, HIPAA, or enter "None"'
+    }
+]
+
+# Category icons for the question cards
+CATEGORY_ICONS = MappingProxyType({
+    'revenue': '📈',
+    'cost': '💰',
+    'risk': '🛡️',
+    'time': '⏱️'
+})
+
+
+@dataclass(frozen=True, slots=True)
+class Option:
+    value: str
+    label: str
+    risk: str
+    cost: float = None
+    hours: float = None
+    frequency: float = None
+    delay: float = None
+    systems: int = None
+
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    id: str
+    category: str
+    question: str
+    subtitle: str
+    follow_up: str
+    follow_up_type: str
+    follow_up_label: str
+    follow_up_help: str
+    options: tuple
+    option_index: MappingProxyType
+
+    def option(self, value):
+        return self.option_index.get(value)
+
+
+def _compile_question(question):
+    options = tuple(Option(**option) for option in question['options'])
+    fields = {key: value for key, value in question.items() if key != 'options'}
+    return Question(
+        options=options,
+        option_index=MappingProxyType({option.value: option for option in options}),
+        **fields
+    )
+
+
+# Read-only registry keyed by question id, built once and shared by all sessions
+registry = MappingProxyType({q['id']: _compile_question(q) for q in questions})
+
+# Question order and option positions for AnswerRecord
+QUESTION_IDS = tuple(q['id'] for q in questions)
+_positions = {question_id: i for i, question_id in enumerate(QUESTION_IDS)}
+_option_positions = {q['id']: {o['value']: i for i, o in enumerate(q['options'])} for q in questions}
+_number_questions = frozenset(q['id'] for q in questions if q['follow_up_type'] == 'number')
+# Options per question with a trailing None, so position -1 selects None
+_question_options = tuple(registry[question_id].options + (None,) for question_id in QUESTION_IDS)
+_NO_OPTIONS = array('b', [-1] * len(QUESTION_IDS))
+_NO_NUMBERS = array('d', [math.nan] * len(QUESTION_IDS))
+
+
+def _parse_number(follow_up):
+    number = float(follow_up)
+    # float() also accepts "nan" and "inf", which no count or amount can be
+    if not math.isfinite(number):
+        raise ValueError(f"follow-up must be a finite number, got {follow_up!r}")
+    return number
+
+
+def _format_number(number):
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+class AnswerRecord:
+    # One respondent's answers: the selected option position per question
+    # (-1 = none) and numeric follow-ups parsed once to floats (NaN = not
+    # answered). Text follow-ups live in a dict that only exists once one is
+    # given. Roughly a quarter the size of the equivalent dict of dicts.
+
+    __slots__ = ('options', 'numbers', 'texts')
+
+    def __init__(self):
+        self.options = _NO_OPTIONS[:]
+        self.numbers = _NO_NUMBERS[:]
+        self.texts = None
+
+    def set_option(self, question_id, value):
+        self.options[_positions[question_id]] = _option_positions[question_id].get(value, -1)
+
+    def option(self, question_id):
+        index = self.options[_positions[question_id]]
+        return registry[question_id].options[index] if index >= 0 else None
+
+    def value(self, question_id):
+        option = self.option(question_id)
+        return option.value if option else None
+
+    def set_follow_up(self, question_id, follow_up):
+        # Empty answers (None, '') count as not answered, like in the dict form;
+        # a number typed as "0" is still an answer. Raises ValueError for a
+        # numeric follow-up that is not a finite number.
+        if question_id in _number_questions:
+            self.numbers[_positions[question_id]] = _parse_number(follow_up) if follow_up else math.nan
+        else:
+            if self.texts is None:
+                self.texts = {}
+            self.texts[question_id] = follow_up
+
+    def decoded(self):
+        # ({question_id: Option or None}, {question_id: float or None}) in one pass
+        options = dict(zip(QUESTION_IDS, map(tuple.__getitem__, _question_options, self.options)))
+        numbers = {question_id: None if number != number else number
+                   for question_id, number in zip(QUESTION_IDS, self.numbers)}
+        return options, numbers
+
+    def number(self, question_id):
+        number = self.numbers[_positions[question_id]]
+        return None if math.isnan(number) else number
+
+    def text(self, question_id, default=None):
+        return self.texts.get(question_id, default) if self.texts else default
+
+    def follow_up(self, question_id):
+        if question_id in _number_questions:
+            number = self.number(question_id)
+            return None if number is None else _format_number(number)
+        return self.text(question_id)
+
+    def is_answered(self, question_id):
+        return self.option(question_id) is not None and bool(self.follow_up(question_id))
+
+    def to_dict(self):
+        # The {question_id: {'value': ..., 'follow_up': ...}} form used before
+        answers = {}
+        for question_id in QUESTION_IDS:
+            answer = {'value': self.value(question_id)}
+            # A text follow-up that was never given stays absent, not None
+            if question_id in _number_questions or question_id in (self.texts or ()):
+                answer['follow_up'] = self.follow_up(question_id)
+            if answer['value'] is not None or answer.get('follow_up') is not None:
+                answers[question_id] = answer
+        return answers
+
+    @classmethod
+    def from_dict(cls, answers):
+        # A numeric follow-up that is not a number counts as not answered, so
+        # it only matters to options that use it (as in batch.score_frame)
+        record = cls()
+        options = record.options
+        numbers = record.numbers
+        for question_id, answer in answers.items():
+            position = _positions.get(question_id)
+            if position is None:
+                continue
+            options[position] = _option_positions[question_id].get(answer.get('value'), -1)
+            if 'follow_up' not in answer:
+                continue
+            follow_up = answer['follow_up']
+            if question_id in _number_questions:
+                try:
+                    numbers[position] = _parse_number(follow_up) if follow_up else math.nan
+                except (TypeError, ValueError):
+                    numbers[position] = math.nan
+            else:
+                record.set_follow_up(question_id, follow_up)
+        return record
+
+    def __getstate__(self):
+        return self.options.tobytes(), self.numbers.tobytes(), self.texts
+
+    def __setstate__(self, state):
+        options, numbers, self.texts = state
+        self.options = array('b', options)
+        self.numbers = array('d', numbers)
+
+
+@instrument('scoring.calculate_findings')
+def calculate_findings(answers):
+    # answers is an AnswerRecord or the equivalent dict of dicts
+    if not isinstance(answers, AnswerRecord):
+        answers = AnswerRecord.from_dict(answers)
+    options, numbers = answers.decoded()
+    config = get_config()
+    findings = {
+        'total_annual_cost': 0,
+        'time_wasted': 0,
+        'risk_exposure': 0,
+        'critical_issues': [],
+        'opportunities': []
+    }
+    
+    # Reporting time calculations
+    option = options['reporting_time']
+    follow_up = numbers['reporting_time']
+    if option and option.cost is not None and follow_up is not None:
+        people = int(follow_up)
+        hours_per_report = option.cost
+        reports_per_year = config.reports_per_year
+        avg_cost_per_hour = config.avg_cost_per_hour
+        annual_cost = hours_per_report * people * reports_per_year * avg_cost_per_hour
+        findings['total_annual_cost'] += annual_cost
+        findings['time_wasted'] += hours_per_report * reports_per_year
+        if option.risk in ['high', 'critical']:
+            findings['critical_issues'].append({
+                'area': 'Report Generation Time',
+                'impact': f"${annual_cost:,.0f}/year in productivity costs",
+                'detail': f"{people} people spending {hours_per_report} hours per report, {reports_per_year} times/year"
+            })
+            findings['opportunities'].append({
+                'area': 'Automated Reporting',
+                'potential': f"Save ${int(annual_cost * 0.8):,.0f}/year by automating report generation",
+                'improvement': '80-90% time reduction'
+            })
+    
+    # Manual work calculations
+    option = options['manual_work']
+    follow_up = numbers['manual_work']
+    if option and option.hours is not None and follow_up is not None:
+        hourly_rate = follow_up
+        weekly_hours = option.hours
+        annual_cost = weekly_hours * 52 * hourly_rate
+        findings['total_annual_cost'] += annual_cost
+        findings['time_wasted'] += weekly_hours * 52
+        if weekly_hours >= 15:
+            findings['critical_issues'].append({
+                'area': 'Manual Data Processing',
+                'impact': f"${annual_cost:,.0f}/year in labor costs",
+                'detail': f"{weekly_hours} hours/week at ${hourly_rate:,.0f}/hour"
+            })
+            findings['opportunities'].append({
+                'area': 'Data Pipeline Automation',
+                'potential': f"Save ${int(annual_cost * 0.75):,.0f}/year through automation",
+                'improvement': '75% reduction in manual work'
+            })
+    
+    # Data accuracy calculations
+    option = options['data_accuracy']
+    follow_up = numbers['data_accuracy']
+    if option and option.frequency is not None and follow_up is not None:
+        cost_per_incident = follow_up
+        monthly_incidents = option.frequency
+        annual_cost = cost_per_incident * monthly_incidents * 12
+        findings['risk_exposure'] += annual_cost
+        if option.risk in ['high', 'critical']:
+            findings['critical_issues'].append({
+                'area': 'Data Quality Issues',
+                'impact': f"${annual_cost:,.0f}/year in bad decisions and rework",
+                'detail': f"{monthly_incidents} incidents/month at ${cost_per_incident:,.0f} each"
+            })
+            findings['opportunities'].append({
+                'area': 'Data Quality Framework',
+                'potential': f"Prevent ${int(annual_cost * 0.7):,.0f}/year in errors",
+                'improvement': '70-90% reduction in data errors'
+            })
+    
+    # Decision speed calculations
+    option = options['decision_speed']
+    follow_up = numbers['decision_speed']
+    if option and option.delay is not None and follow_up is not None:
+        opportunities_per_month = int(follow_up)
+        avg_opportunity_value = config.avg_opportunity_value
+        opportunities_lost = opportunities_per_month * config.lost_opportunity_rate
+        annual_cost = opportunities_lost * 12 * avg_opportunity_value
+        findings['risk_exposure'] += annual_cost
+        if option.risk in ['high', 'critical']:
+            findings['critical_issues'].append({
+                'area': 'Slow Decision Making',
+                'impact': f"${annual_cost:,.0f}/year in missed opportunities",
+                'detail': f"{option.delay}-day delays on {opportunities_per_month} monthly opportunities"
+            })
+            findings['opportunities'].append({
+                'area': 'Real-Time Analytics',
+                'potential': f"Capture ${int(annual_cost * 0.6):,.0f}/year in faster decisions",
+                'improvement': 'Decision time from days to minutes'
+            })
+    
+    # Data silos calculations
+    option = options['data_silos']
+    follow_up = numbers['data_silos']
+    if option and option.systems is not None and follow_up is not None:
+        hours_per_week = follow_up
+        annual_cost = hours_per_week * 52 * config.avg_cost_per_hour
+        findings['total_annual_cost'] += annual_cost
+        findings['time_wasted'] += hours_per_week * 52
+        if option.systems >= 6:
+            findings['critical_issues'].append({
+                'area': 'Data Silos & Integration',
+                'impact': f"${annual_cost:,.0f}/year in integration labor",
+                'detail': f"{option.systems} disconnected systems, {hours_per_week} hours/week to reconcile"
+            })
+            findings['opportunities'].append({
+                'area': 'Unified Data Platform',
+                'potential': f"Save ${int(annual_cost * 0.7):,.0f}/year with integrated data",
+                'improvement': 'Single source of truth across all systems'
+            })
+    
+    # Compliance audit calculations
+    option = options['compliance_audit']
+    exposure = config.compliance_exposure.get(option.value) if option else None
+    if exposure is not None:
+        findings['risk_exposure'] += exposure
+        if option.risk in ['high', 'critical']:
+            compliance = answers.text('compliance_audit', 'regulatory requirements')
+            findings['critical_issues'].append({
+                'area': 'Compliance & Audit Risk',
+                'impact': f"${exposure:,.0f} potential exposure",
+                'detail': f"Inadequate audit trail for {compliance}"
+            })
+            findings['opportunities'].append({
+                'area': 'Data Governance & Compliance',
+                'potential': f"Mitigate ${exposure:,.0f} in compliance risk",
+                'improvement': 'Full audit trail and regulatory compliance'
+            })
+    
+    return findings
@@ -0,0 +1,163 @@
+# Economic assumptions behind both apps' numbers, read from a JSON file so they
+# can be tuned (e.g. per region) without a redeploy.
+# The file is scoring_config.json next to this module unless SCORING_CONFIG
+# points elsewhere. It is loaded and validated once, then get_config() only
+# checks the file's modification time, at most every CHECK_INTERVAL seconds,
+# and reloads when it changed. A reload that fails validation keeps the last
+# good config and reports the problem on stderr; an invalid file at startup
+# raises ValueError.
+#
+# Every config has a version (a hash of its values). Results computed ahead of
+# time, like the precomputed diagnostic table and cached reports, carry it so
+# they are not served after the assumptions change.
+import functools
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(HERE, 'scoring_config.json')
+CHECK_INTERVAL = 5.0
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    # Maturity assessment (scoring.py, batch.py, linear_model.py)
+    reports_per_year: float
+    avg_cost_per_hour: float
+    avg_opportunity_value: float
+    lost_opportunity_rate: float
+    compliance_exposure: MappingProxyType
+    # Executive diagnostic (diagnostic.py): revenue at risk is
+    # base_cost_rate + pain_score * pain_cost_rate of revenue, and the
+    # investment is investment_rate of revenue but at least min_investment
+    base_cost_rate: float
+    pain_cost_rate: float
+    investment_rate: float
+    min_investment: float
+    version: str
+
+
+# Share of something, so at most 1
+_RATES = ('lost_opportunity_rate', 'base_cost_rate', 'pain_cost_rate', 'investment_rate')
+_NUMBERS = ('reports_per_year', 'avg_cost_per_hour', 'avg_opportunity_value', 'min_investment') + _RATES
+
+
+def _check_number(name, value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise ValueError(f"{name} must be a non-negative number, got {value!r}")
+    return value
+
+
+def _compliance_options():
+    # Imported here because scoring reads its config from this module
+    import scoring
+    return {option.value for option in scoring.registry['compliance_audit'].options}
+
+
+def parse(values):
+    # Validated ScoringConfig from the decoded JSON; raises ValueError
+    if not isinstance(values, dict):
+        raise ValueError("scoring config must be a JSON object")
+    expected = set(_NUMBERS) | {'compliance_exposure'}
+    missing = expected - values.keys()
+    unknown = values.keys() - expected
+    if missing or unknown:
+        raise ValueError(f"scoring config: missing {sorted(missing)}, unknown {sorted(unknown)}")
+    numbers = {name: _check_number(name, values[name]) for name in _NUMBERS}
+    for name in _RATES:
+        if numbers[name] > 1:
+            raise ValueError(f"{name} is a share of revenue or opportunities and must be at most 1, got {numbers[name]}")
+    exposure = values['compliance_exposure']
+    if not isinstance(exposure, dict):
+        raise ValueError("compliance_exposure must map compliance_audit options to amounts")
+    unknown = exposure.keys() - _compliance_options()
+    if unknown:
+        raise ValueError(f"compliance_exposure: unknown compliance_audit options {sorted(unknown)}")
+    exposure = {option: _check_number(f"compliance_exposure.{option}", amount) for option, amount in exposure.items()}
+    canonical = json.dumps(dict(numbers, compliance_exposure=exposure), sort_keys=True, separators=(',', ':'))
+    return ScoringConfig(compliance_exposure=MappingProxyType(exposure),
+                         version=hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12],
+                         **numbers)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as handle:
+        try:
+            values = json.load(handle)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{path}: {error}") from None
+    return parse(values)
+
+
+class ConfigCache:
+
+    def __init__(self, path, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._config = None
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        # Between checks this is one clock read and a comparison
+        if time.monotonic() < self._next_check:
+            return self._config
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_check:
+                self._refresh()
+                self._next_check = now + self.check_interval
+            return self._config
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as error:
+            if self._config is None:
+                raise ValueError(f"scoring config {self.path} is unreadable: {error}") from None
+            print(f"scoring config: keeping the loaded config, {error}", file=sys.stderr)
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            config = load(self.path)
+        except (OSError, ValueError) as error:
+            if self._config is None:
+                raise
+            print(f"scoring config: keeping version {self._config.version}, {error}", file=sys.stderr)
+        else:
+            if self._config is not None:
+                self.reloads += 1
+            self._config = config
+        # Not retried until the file changes again
+        self._mtime = mtime
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _cache(path):
+    with _caches_lock:
+        return _caches.setdefault(path, ConfigCache(path))
+
+
+@functools.cache
+def _default_cache():
+    # SCORING_CONFIG is read once, on first use
+    return _cache(os.environ.get('SCORING_CONFIG') or DEFAULT_PATH)
+
+
+def get_config(path=None):
+    # Current config for the path (default: SCORING_CONFIG or scoring_config.json);
+    # cheap enough to call on every scoring call
+    return (_cache(path) if path else _default_cache()).get()
@@ -0,0 +1,157 @@
+# HTML templates for the maturity app (maturity.py and report.py).
+# Each template is split once at import into its literal markup and fields, so
+# a render only formats the fields and joins the pieces.
+#   {name}        text field, HTML-escaped (some text is typed in by the
+#                 respondent, e.g. the compliance follow-up)
+#   {name:spec}   number formatted with the spec, e.g. {total_impact:,.0f}
+import functools
+import re
+from html import escape
+from string import Formatter
+
+import scoring
+
+
+_unsafe = re.compile(r'[&<>"\']')
+
+
+@functools.lru_cache(maxsize=4096)
+def _escape_text(text):
+    return escape(text) if _unsafe.search(text) else text
+
+
+def _escape(value):
+    # Most text comes from the question bank and repeats across reports
+    return _escape_text(str(value))
+
+
+class Template:
+
+    def __init__(self, markup):
+        self.markup = markup
+        # Split once into the literal markup, with None in each field's slot,
+        # and (slot, name, spec) for every field, in order
+        pieces = []
+        slots = []
+        fields = []
+        for literal, name, spec, _ in Formatter().parse(markup):
+            if literal:
+                pieces.append(literal)
+            if name is not None:
+                if name not in fields:
+                    fields.append(name)
+                slots.append((len(pieces), name, spec))
+                pieces.append(None)
+        self.pieces = tuple(pieces)
+        self.slots = tuple(slots)
+        self.fields = tuple(fields)
+
+    def render(self, **values):
+        pieces = list(self.pieces)
+        for slot, name, spec in self.slots:
+            value = values[name]
+            pieces[slot] = format(value, spec) if spec else _escape(value)
+        return ''.join(pieces)
+
+
+# Report (report.py)
+
+TOTAL_IMPACT = Template("""
+    <div style='background: linear-gradient(135deg, #fef2f2 0%, #fee2e2 100%); border-left: 4px solid #dc2626; padding: 2rem; border-radius: 0.75rem; margin: 2rem 0;'>
+        <h2 style='color: #991b1b; margin-bottom: 1rem; font-size: 1.5rem;'>Total Annual Impact Identified</h2>
+        <div style='font-size: 3rem; font-weight: 800; color: #dc2626; margin-bottom: 1rem;'>
+            ${total_impact:,.0f}
+        </div>
+        <p style='color: #6b7280; font-size: 0.95rem;'>Estimated annual cost and risk exposure from data challenges</p>
+    </div>
+    """)
+
+ISSUE_CARD = Template("""
+            <div style='background: #fff; border: 2px solid #fed7aa; border-radius: 0.75rem; padding: 1.5rem; margin-bottom: 1rem;'>
+                <h4 style='color: #1f2937; margin: 0 0 0.5rem 0; font-size: 1.1rem;'>{area}</h4>
+                <p style='color: #dc2626; font-weight: 600; margin: 0 0 0.5rem 0; font-size: 1rem;'>{impact}</p>
+                <p style='color: #6b7280; margin: 0; font-size: 0.9rem;'>{detail}</p>
+            </div>
+            """)
+
+OPPORTUNITY_CARD = Template("""
+            <div style='background: linear-gradient(135deg, #f0fdf4 0%, #dcfce7 100%); border: 2px solid #86efac; border-radius: 0.75rem; padding: 1.5rem; margin-bottom: 1rem;'>
+                <h4 style='color: #1f2937; margin: 0 0 0.5rem 0; font-size: 1.1rem;'>{area}</h4>
+                <p style='color: #059669; font-weight: 600; margin: 0 0 0.5rem 0; font-size: 1rem;'>{potential}</p>
+                <p style='color: #6b7280; margin: 0; font-size: 0.9rem;'>{improvement}</p>
+            </div>
+            """)
+
+BOTTOM_LINE = Template("""
+    <div style='background: linear-gradient(135deg, #eff6ff 0%, #dbeafe 100%); border-left: 4px solid #3b82f6; padding: 2rem; border-radius: 0.75rem; margin: 2rem 0;'>
+        <h3 style='color: #1e40af; margin-bottom: 1rem;'>Bottom Line</h3>
+        <p style='color: #374151; margin-bottom: 1.5rem; line-height: 1.8; font-size: 1rem;'>
+            Based on your responses, your organization is facing <strong>${total_impact:,.0f}</strong> in 
+            annual costs and risk exposure due to data challenges. The good news: most of this is preventable 
+            with the right data infrastructure and processes.
+        </p>
+        <div style='background: white; border-radius: 0.75rem; padding: 1.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
+            <div style='color: #6b7280; margin-bottom: 0.5rem; font-size: 0.9rem;'>Estimated First-Year ROI with Data Solutions</div>
+            <div style='font-size: 2.5rem; font-weight: 800; color: #3b82f6; margin-bottom: 0.5rem;'>
+                {roi_percent}% ROI
+            </div>
+            <div style='color: #6b7280; font-size: 0.9rem;'>Typical 6-8 month payback period</div>
+        </div>
+    </div>
+    """)
+
+CALL_TO_ACTION = Template("""
+    <div style='background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%); color: white; padding: 2.5rem; border-radius: 0.75rem; margin: 2rem 0;'>
+        <h2 style='color: white; margin-bottom: 1.5rem; font-size: 1.75rem;'>Ready to Transform Your Data Operations?</h2>
+        <p style='opacity: 0.95; margin-bottom: 2rem; font-size: 1.05rem; line-height: 1.7;'>
+            Let's discuss a strategic data solution tailored to your business. Our solutions can help you:
+        </p>
+        <div style='background: rgba(255,255,255,0.1); border-radius: 0.5rem; padding: 1.5rem; margin-bottom: 2rem;'>
+            <div style='margin-bottom: 1rem; display: flex; align-items: start;'>
+                <span style='font-size: 1.5rem; margin-right: 1rem;'>💰</span>
+                <span>Recover <strong>${recoverable_cost:,.0f}</strong> annually in productivity costs</span>
+            </div>
+            <div style='margin-bottom: 1rem; display: flex; align-items: start;'>
+                <span style='font-size: 1.5rem; margin-right: 1rem;'>🛡️</span>
+                <span>Mitigate <strong>${risk_exposure:,.0f}</strong> in risk exposure</span>
+            </div>
+            <div style='display: flex; align-items: start;'>
+                <span style='font-size: 1.5rem; margin-right: 1rem;'>⚡</span>
+                <span>Enable data-driven decisions in <strong>minutes instead of days</strong></span>
+            </div>
+        </div>
+        <div style='border-top: 1px solid rgba(255,255,255,0.2); padding-top: 2rem;'>
+            <p style='font-size: 1.25rem; font-weight: 600; margin-bottom: 0.75rem;'>Schedule a 30-Minute Strategy Call</p>
+            <p style='opacity: 0.9; margin-bottom: 1.5rem;'>No obligation. We'll discuss your specific situation and potential solutions.</p>
+            <div style='display: flex; flex-wrap: wrap; gap: 2rem; font-size: 1rem;'>
+                <div><strong>Email:</strong> jayron.soares@gayaanalytics.com.br</div>
+                <div><strong>Phone:</strong> +55(21) 98983-8805</div>
+            </div>
+        </div>
+    </div>
+    """)
+
+# Question flow (maturity.show_question)
+
+QUESTION_CONTAINER = """
+    <div style='background: white; padding: 2.5rem; border-radius: 1rem; box-shadow: 0 10px 40px rgba(0,0,0,0.1); margin: 2rem auto; max-width: 900px;'>
+    """
+
+FOLLOW_UP_CONTAINER = """
+        <div style='background: #eff6ff; border: 1px solid #bfdbfe; padding: 1.5rem; border-radius: 0.75rem;'>
+        """
+
+QUESTION_PROGRESS = Template(
+    "<p style='text-align: right; color: #6b7280; margin-top: 0.5rem;'>Question {number} of {total}</p>")
+
+QUESTION_SUBTITLE = Template(
+    "<p style='color: #6b7280; font-size: 1rem; margin-bottom: 2rem;'>{subtitle}</p>")
+
+# Everything in a question's heading is static, so it is rendered once per question
+question_headings = {
+    q['id']: (f"## {scoring.CATEGORY_ICONS.get(q['category'], '📋')} {q['question']}",
+              QUESTION_SUBTITLE.render(subtitle=q['subtitle']))
+    for q in scoring.questions
+}
+question_progress = [QUESTION_PROGRESS.render(number=i + 1, total=len(scoring.questions))
+                     for i in range(len(scoring.questions))]
@@ -0,0 +1,108 @@
+# answer_token must round-trip every AnswerRecord and reject malformed tokens
+import base64
+import math
+import random
+import struct
+
+import pytest
+
+import answer_token
+import scoring
+
+TEXTS = ['SOX', 'GDPR, HIPAA', 'ü' * 200]
+
+
+def random_record(rng):
+    record = scoring.AnswerRecord()
+    for question in scoring.questions:
+        if rng.random() < 0.2:
+            continue
+        record.set_option(question['id'], rng.choice(question['options'])['value'])
+        if question['follow_up_type'] == 'number':
+            follow_up = rng.choice([None, '0', str(rng.randint(1, 10 ** 6)), repr(rng.uniform(-1e6, 1e6))])
+        else:
+            follow_up = rng.choice([None, *TEXTS])
+        if rng.random() < 0.9:
+            record.set_follow_up(question['id'], follow_up)
+    return record
+
+
+def expected_dict(record):
+    # Text follow-ups past MAX_TEXT_BYTES keep their first MAX_TEXT_BYTES bytes
+    answers = record.to_dict()
+    for answer in answers.values():
+        if isinstance(answer.get('follow_up'), str):
+            encoded = answer['follow_up'].encode('utf-8')[:answer_token.MAX_TEXT_BYTES]
+            answer['follow_up'] = encoded.decode('utf-8', errors='ignore')
+    return answers
+
+
+def test_round_trip():
+    rng = random.Random(1)
+    for _ in range(2000):
+        record = random_record(rng)
+        token = answer_token.encode(record)
+        assert len(token) <= answer_token.MAX_TOKEN_LENGTH
+        assert set(token) <= set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_')
+        decoded, current_question, show_report = answer_token.decode(token)
+        assert decoded.to_dict() == expected_dict(record)
+        assert (current_question, show_report) == (0, False)
+
+
+def test_position_is_clamped_to_the_first_unanswered_question():
+    record = scoring.AnswerRecord.from_dict({'reporting_time': {'value': 'days', 'follow_up': '4'}})
+    assert answer_token.decode(answer_token.encode(record, 5, True))[1:] == (1, False)
+    complete = scoring.AnswerRecord.from_dict({
+        question['id']: {'value': question['options'][0]['value'], 'follow_up': '1'}
+        for question in scoring.questions
+    })
+    assert answer_token.decode(answer_token.encode(complete, 5, True))[1:] == (5, True)
+
+
+def float_token(number):
+    # Token with a float follow-up written by hand: encode() never writes
+    # non-finite floats, and stores NaN as unanswered
+    bits = answer_token._BitWriter()
+    bits.write(answer_token.VERSION, 4)
+    bits.write(0, 4)
+    for _ in scoring.QUESTION_IDS:
+        bits.write(1, answer_token._OPTION_BITS)
+    bits.write(answer_token._FLOAT, 2)
+    bits.write(int.from_bytes(struct.pack('>d', number), 'big'), 64)
+    # Remaining number tags are _NONE and the text tag _ABSENT
+    bits.write(0, 2 * (len(scoring.QUESTION_IDS) - 1))
+    return base64.urlsafe_b64encode(bits.to_bytes()).rstrip(b'=').decode('ascii')
+
+
+def test_hand_written_token():
+    record = answer_token.decode(float_token(2.5))[0]
+    assert record.number('reporting_time') == 2.5
+
+
+@pytest.mark.parametrize('token', [
+    '',
+    'not a token!',
+    'A' * (answer_token.MAX_TOKEN_LENGTH + 1),
+    # Version 0
+    'AAAAAAA',
+    # Truncated after the header
+    'EA',
+    # Option position 7 of 5 on the first question
+    'EP____',
+    float_token(math.inf),
+    float_token(-math.inf),
+    float_token(math.nan),
+])
+def test_malformed_tokens(token):
+    with pytest.raises(ValueError):
+        answer_token.decode(token)
+
+
+@pytest.mark.parametrize('follow_up', ['inf', '-Infinity', 'nan'])
+def test_non_finite_follow_ups(follow_up):
+    record = scoring.AnswerRecord()
+    with pytest.raises(ValueError):
+        record.set_follow_up('reporting_time', follow_up)
+    answers = {'reporting_time': {'value': 'days', 'follow_up': follow_up}}
+    assert scoring.AnswerRecord.from_dict(answers).number('reporting_time') is None
+    assert scoring.calculate_findings(answers)['time_wasted'] == 0
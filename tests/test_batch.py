@@ -0,0 +1,95 @@
+# batch.score_frame must reproduce scoring.calculate_findings row for row
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch
+import scoring
+
+TOTALS = ('total_annual_cost', 'risk_exposure', 'time_wasted')
+NUMBERS = [None, '', '0', '3', '12.5', '400', 'abc', 'inf', '-Infinity', '1e400', '1_000']
+TEXTS = [None, '', 'SOX', 'GDPR, HIPAA']
+
+
+def random_answers(rng, numbers):
+    # Each question is skipped, answered without a follow-up or answered with
+    # one drawn from `numbers` (or TEXTS for the compliance question)
+    answers = {}
+    for question in scoring.questions:
+        if rng.random() < 0.05:
+            continue
+        answer = {'value': rng.choice(question['options'])['value']}
+        if rng.random() > 0.05:
+            answer['follow_up'] = rng.choice(numbers if question['follow_up_type'] == 'number' else TEXTS)
+        answers[question['id']] = answer
+    return answers
+
+
+def assert_matches(answer_sets, frame):
+    scored = batch.score_frame(frame)
+    for (_, row), answers in zip(scored.iterrows(), answer_sets):
+        findings = scoring.calculate_findings(answers)
+        for total in TOTALS:
+            assert row[total] == pytest.approx(findings[total]), (total, answers)
+        assert row['critical_issue_count'] == len(findings['critical_issues']), answers
+
+
+def test_string_follow_ups():
+    rng = random.Random(1)
+    answer_sets = [random_answers(rng, NUMBERS) for _ in range(2000)]
+    assert_matches(answer_sets, batch.answers_frame(answer_sets))
+
+
+def test_numeric_follow_ups():
+    # Follow-ups read back as numbers, e.g. from a Parquet export
+    rng = random.Random(2)
+    answer_sets = [random_answers(rng, [None, 0, 0.0, 3, 12.5, 400, np.inf, -np.inf]) for _ in range(2000)]
+    frame = batch.answers_frame(answer_sets)
+    for question_id in batch.QUESTION_IDS:
+        if scoring.registry[question_id].follow_up_type == 'number':
+            column = batch.follow_up_column(question_id)
+            frame[column] = pd.to_numeric(frame[column])
+            assert pd.api.types.is_numeric_dtype(frame[column])
+    assert_matches(answer_sets, frame)
+
+
+def test_mixed_follow_ups():
+    # Object columns mixing strings and numbers, e.g. answers loaded from JSON
+    rng = random.Random(3)
+    answer_sets = [random_answers(rng, [None, 0, '0', 3, '3', 12.5, '1_000', 'abc', np.inf]) for _ in range(2000)]
+    frame = batch.answers_frame(answer_sets)
+    assert frame['reporting_time_follow_up'].dtype == object
+    assert_matches(answer_sets, frame)
+
+
+def test_zero_follow_up_is_unanswered():
+    answers = {'reporting_time': {'value': 'days', 'follow_up': 0}}
+    frame = pd.DataFrame({'reporting_time': ['days'], 'reporting_time_follow_up': [0]})
+    scored = batch.score_frame(frame)
+    assert scoring.calculate_findings(answers)['time_wasted'] == 0
+    assert scored['time_wasted'].iloc[0] == 0
+    assert not scored['critical_reporting_time'].iloc[0]
+
+
+def test_unparsable_follow_up_is_unanswered():
+    # Only an error for options that use the number, and then it is unscored
+    assert scoring.calculate_findings({'reporting_time': {'value': 'minutes', 'follow_up': 'abc'}})['time_wasted'] == 0
+    assert scoring.calculate_findings({'reporting_time': {'value': 'days', 'follow_up': 'abc'}})['time_wasted'] == 0
+
+
+def test_non_finite_follow_up_is_unanswered():
+    frame = pd.DataFrame({'reporting_time': ['days', 'days'], 'reporting_time_follow_up': ['inf', '1e400']})
+    scored = batch.score_frame(frame)
+    assert (scored['time_wasted'] == 0).all()
+    assert not scored['critical_reporting_time'].any()
+
+
+def test_missing_columns():
+    # Questions absent from the frame score like unanswered questions
+    answer_sets = [{'compliance_audit': {'value': 'worried', 'follow_up': 'SOX'}},
+                   {'reporting_time': {'value': 'week', 'follow_up': '5'}}]
+    frame = batch.answers_frame(answer_sets)[['compliance_audit', 'reporting_time', 'reporting_time_follow_up']]
+    assert_matches(answer_sets, frame)
+    assert np.isfinite(batch.score_frame(frame)[list(TOTALS)].to_numpy()).all()
@@ -0,0 +1,59 @@
+# linear_model must match batch.score_frame and scoring.calculate_findings
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch
+import linear_model
+import scoring
+
+NUMBERS = [None, '', '0', '3', '12.5', '400', 'abc', 'inf', '1e400']
+TEXTS = [None, '', 'SOX']
+
+
+def random_answers(rng):
+    answers = {}
+    for question in scoring.questions:
+        if rng.random() < 0.05:
+            continue
+        answer = {'value': rng.choice(question['options'])['value']}
+        if rng.random() > 0.05:
+            answer['follow_up'] = rng.choice(NUMBERS if question['follow_up_type'] == 'number' else TEXTS)
+        answers[question['id']] = answer
+    return answers
+
+
+def test_score_frame_matches_batch_and_findings():
+    rng = random.Random(3)
+    answer_sets = [random_answers(rng) for _ in range(2000)]
+    frame = batch.answers_frame(answer_sets)
+    scored = linear_model.score_frame(frame)
+    expected = batch.score_frame(frame)
+    for metric in linear_model.METRICS:
+        np.testing.assert_allclose(scored[metric], expected[metric], rtol=1e-12)
+    for (_, row), answers in zip(scored.iterrows(), answer_sets):
+        findings = scoring.calculate_findings(answers)
+        for metric in linear_model.METRICS:
+            assert row[metric] == pytest.approx(findings[metric]), (metric, answers)
+
+
+def test_non_finite_follow_ups_do_not_contribute():
+    # Non-finite follow-ups passed straight to score() count as unanswered
+    codes = np.full(len(linear_model.QUESTION_IDS), -1)
+    follow_ups = np.full(len(linear_model.QUESTION_IDS), np.nan)
+    codes[linear_model.QUESTION_IDS.index('reporting_time')] = 0
+    follow_ups[linear_model.QUESTION_IDS.index('reporting_time')] = np.inf
+    codes[linear_model.QUESTION_IDS.index('compliance_audit')] = 4
+    result = linear_model.score(codes, follow_ups)
+    findings = scoring.calculate_findings({'reporting_time': {'value': 'minutes', 'follow_up': 'inf'},
+                                           'compliance_audit': {'value': 'worried'}})
+    assert list(result) == [findings[metric] for metric in linear_model.METRICS]
+    assert not linear_model.sensitivities(codes, follow_ups).any()
+
+
+def test_sensitivity_frame_is_finite():
+    frame = pd.DataFrame({'manual_work': ['extreme', 'extreme'], 'manual_work_follow_up': ['inf', '50']})
+    partials = linear_model.sensitivity_frame(frame)['total_annual_cost_per_manual_work']
+    assert list(partials) == [0, 50 * 52]
@@ -0,0 +1,18 @@
+# Answers that score differently must not share a report cache entry
+import report_cache
+import scoring
+
+
+def test_absent_and_none_follow_ups_differ():
+    absent = {'compliance_audit': {'value': 'worried'}}
+    cleared = {'compliance_audit': {'value': 'worried', 'follow_up': None}}
+    assert scoring.calculate_findings(absent) != scoring.calculate_findings(cleared)
+    assert report_cache.answers_fingerprint(absent) != report_cache.answers_fingerprint(cleared)
+    assert (report_cache.answers_fingerprint(scoring.AnswerRecord.from_dict(absent))
+            != report_cache.answers_fingerprint(scoring.AnswerRecord.from_dict(cleared)))
+
+
+def test_equivalent_numbers_share_a_key():
+    keys = {report_cache.answers_fingerprint({'reporting_time': {'value': 'days', 'follow_up': follow_up}})
+            for follow_up in ('4', '4.0', 4)}
+    assert len(keys) == 1